@@ -1,4 +1,40 @@
 import requests
+from requests.adapters import HTTPAdapter
+
+# Prefer orjson for whole-document parsing, fall back to the standard library
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Try to import requests-cache for transparent on-disk HTTP caching
+try:
+    from requests_cache import CachedSession
+
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# How long a cached listing stays fresh, in seconds
+CACHE_EXPIRE_AFTER = 3600
+
+# Seconds to wait for Reddit before giving up on a request
+REQUEST_TIMEOUT = 10
+
+if REQUESTS_CACHE_AVAILABLE:
+    _session = CachedSession(
+        "reddit_cache",
+        use_cache_dir=True,
+        expire_after=CACHE_EXPIRE_AFTER,
+        allowable_methods=("GET",),
+    )
+else:
+    _session = requests.Session()
+
+# Set a proper user agent to avoid 429 Too Many Requests errors
+_session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; RedditTextFetcher/1.0)"})
+# Keep a small pool of connections alive so repeated fetches skip the TLS handshake
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 
 def get_datasource_name():
@@ -22,16 +58,11 @@ def get_reddit_posts(subreddit="entitledparents", time_period="day", limit=20):
     """
     url = f"https://www.reddit.com/r/{subreddit}/top.json?t={time_period}&limit={limit}"
 
-    # Set a proper user agent to avoid 429 Too Many Requests errors
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; RedditTextFetcher/1.0)"
-    }
-
     try:
-        response = requests.get(url, headers=headers)
+        response = _session.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()  # Raise an exception for HTTP errors
 
-        data = response.json()
+        data = _json_loads(response.content)
         posts = []
 
         # Extract relevant information from each post
@@ -52,7 +83,7 @@ def get_reddit_posts(subreddit="entitledparents", time_period="day", limit=20):
 
         return posts
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Error fetching Reddit posts: {e}")
         return []
 
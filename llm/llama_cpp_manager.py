@@ -3,21 +3,52 @@ llama_cpp_manager.py - Manager for loading and using LLaMa models via llama-cpp-
 """
 import os
 import logging
-from typing import Optional
+from typing import Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
 # Try to import llama-cpp-python
 try:
-    from llama_cpp import Llama
+    from llama_cpp import Llama, LlamaRAMCache
 
     LLAMACPP_AVAILABLE = True
     LLAMACPP_IMPORT_ERROR = None
 except ImportError as e:
     LLAMACPP_AVAILABLE = False
     LLAMACPP_IMPORT_ERROR = str(e)
-    logger.warning(f"llama-cpp-python not installed: {e}. \
-                   Install with: pip install llama-cpp-python")
+    logger.warning("llama-cpp-python not installed: %s. Install with: pip install llama-cpp-python", e)
+
+# Try to import psutil to tell physical cores from SMT siblings
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Size of the in-memory KV cache used to reuse shared prompt prefixes
+PROMPT_CACHE_BYTES = 512 << 20
+
+# Initial context window, grown on demand up to MAX_CONTEXT for longer prompts
+DEFAULT_CONTEXT = 2048
+MAX_CONTEXT = 8192
+
+# Llama options only understood by newer llama-cpp-python releases
+_OPTIONAL_PARAMS = ("flash_attn", "type_k", "type_v")
+
+# Models already loaded in this process, keyed by model path and load parameters
+_MODEL_CACHE = {}
+
+
+def _physical_core_count() -> int:
+    """Return the number of physical CPU cores, ignoring SMT siblings."""
+    cores = None
+    if PSUTIL_AVAILABLE:
+        cores = psutil.cpu_count(logical=False)
+    if not cores:
+        # Assume two hardware threads per core when psutil can't tell us
+        cores = (os.cpu_count() or 2) // 2
+    return max(cores, 1)
 
 
 class LlamaCppManager:
@@ -31,24 +62,41 @@ class LlamaCppManager:
         """
         self._direct_model_path = model_path
         self._loaded_model: Llama = None
+        self._load_args = (None, {})
+        self._cache_key = None
 
-    def load_model(self, **kwargs):
+    def load_model(self, kv_cache_type: Optional[str] = "q8_0", **kwargs):
         """
         Load a LLaMa model.
 
+        For the best throughput/quality trade-off the model path should point
+        at a Q4_K_M or Q5_K_M GGUF file.
+
         Args:
             model_name: Model identifier or "default" to use the direct model path
-            **kwargs: Additional arguments to pass to Llama initialization
+            kv_cache_type: Quantize the KV cache to this GGML type (e.g. "q8_0", "f16").
+                           Ignored by llama-cpp-python builds that don't support it;
+                           None keeps the library default.
+            **kwargs: Additional arguments to pass to Llama initialization; these
+                      override the defaults (n_batch, n_ubatch, n_threads,
+                      n_threads_batch, use_mmap, use_mlock, flash_attn, offload_kqv...)
 
         Returns:
             Loaded Llama model or None if loading failed
         """
+        if self._loaded_model is not None:
+            return self._loaded_model
+
         if not LLAMACPP_AVAILABLE:
-            logger.error("Cannot load model: llama-cpp-python not installed")
-            logger.info(self.get_installation_help())
+            logger.error("Cannot load model: llama-cpp-python not installed (%s)", LLAMACPP_IMPORT_ERROR)
+            return None
 
         if not os.path.isfile(self._direct_model_path):
-            logger.error(f"Model file not found: {self._direct_model_path}")
+            logger.error("Model file not found: %s", self._direct_model_path)
+            return None
+
+        # Remember how the model was loaded so it can be reloaded with a larger context
+        self._load_args = (kv_cache_type, kwargs)
 
         try:
             # Check GPU availability through llama-cpp-python
@@ -63,16 +111,29 @@ class LlamaCppManager:
 
             # Optimized parameters for RTX 4070 GPU
             params = {
-                "n_ctx": 8192,            # Context window - full model capacity
+                "n_ctx": DEFAULT_CONTEXT,  # Context window - grown on demand by generate()
                 "n_batch": 1024,          # Increased batch size for better throughput
+                "n_ubatch": 512,          # Physical micro-batch size for prompt processing
                 "n_gpu_layers": 35,       # Explicitly set number of layers on GPU (35 is good for 8B model)
                 "verbose": False,         # No verbose output
                 "main_gpu": 0,            # Use the primary GPU
                 "tensor_split": [1.0],    # Assign all tensors to GPU 0
                 "f16_kv": True,           # Use half-precision for key/value cache
-                "use_mlock": True,        # Lock memory to prevent swapping
+                "use_mlock": False,       # mmap'd pages are kept resident without pinning all RAM
+                "use_mmap": True,         # Map weights from disk instead of copying them into RAM
+                "flash_attn": True,       # Fused attention kernel, less KV cache traffic
+                "offload_kqv": True,      # Keep the KV cache on the GPU with the layers
             }
 
+            # Store the KV cache in a quantized format to halve its memory traffic
+            if kv_cache_type:
+                ggml_type = getattr(llama_cpp, f"GGML_TYPE_{kv_cache_type.upper()}", None)
+                if ggml_type is None:
+                    logger.warning("KV cache type %s not supported by this llama-cpp-python", kv_cache_type)
+                else:
+                    params["type_k"] = ggml_type
+                    params["type_v"] = ggml_type
+
             # Use absolute maximum GPU layers if the user specified -1
             if kwargs.get("n_gpu_layers", 0) == -1 and gpu_available:
                 logger.info("Using maximum GPU layers for model acceleration")
@@ -81,12 +142,66 @@ class LlamaCppManager:
             # Update with user-provided params
             params.update(kwargs)
 
-            logger.info(f"Loading model from {self._direct_model_path}")
-            self._loaded_model = Llama(model_path=self._direct_model_path, **params)
-            logger.info(f"Model {self._loaded_model.model_path} loaded successfully")
+            # One thread per physical core; SMT over-subscription slows prompt eval
+            physical_cores = _physical_core_count()
+            params.setdefault("n_threads", physical_cores)
+            params.setdefault("n_threads_batch", physical_cores)
+
+            # Reuse a model another manager already loaded with the same settings
+            cache_key = (self._direct_model_path, repr(sorted(params.items())))
+            self._cache_key = cache_key
+            if cache_key in _MODEL_CACHE:
+                logger.info("Reusing loaded model %s", self._direct_model_path)
+                self._loaded_model = _MODEL_CACHE[cache_key]
+                return self._loaded_model
+
+            logger.info("Loading model from %s", self._direct_model_path)
+            try:
+                model = Llama(model_path=self._direct_model_path, **params)
+            except TypeError as e:
+                # Older llama-cpp-python releases don't know the newer attention/KV options
+                logger.warning("Retrying without flash attention and KV cache quantization: %s", e)
+                for key in _OPTIONAL_PARAMS:
+                    params.pop(key, None)
+                model = Llama(model_path=self._direct_model_path, **params)
+
+            # Keep evaluated prompt states around so repeated prefixes are not re-evaluated
+            model.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_BYTES))
+            _MODEL_CACHE[cache_key] = model
+            self._loaded_model = model
+            logger.info("Model %s loaded successfully", self._direct_model_path)
+            return self._loaded_model
 
         except Exception as e:
-            logger.error(f"Failed to load model {self._loaded_model.model_path}: {str(e)}")
+            logger.error("Failed to load model %s: %s", self._direct_model_path, e)
+            return None
+
+    def _ensure_context(self, prompt: str, max_tokens: int):
+        """
+        Reload the model with a larger context window if the request may not fit.
+
+        Args:
+            prompt: Prompt about to be evaluated
+            max_tokens: Maximum tokens that will be generated
+        """
+        if self._loaded_model is None:
+            return
+
+        # Roughly 3 characters per token, plus some slack for the template
+        needed = len(prompt) // 3 + max_tokens + 128
+        current = self._loaded_model.n_ctx()
+        if needed <= current:
+            return
+
+        n_ctx = min(MAX_CONTEXT, 1 << (needed - 1).bit_length())
+        if n_ctx <= current:
+            return
+
+        logger.info("Growing context window from %d to %d tokens", current, n_ctx)
+        _MODEL_CACHE.pop(self._cache_key, None)
+        self._loaded_model = None
+        kv_cache_type, kwargs = self._load_args
+        self.load_model(kv_cache_type, **{**kwargs, "n_ctx": n_ctx})
 
     def generate(
         self,
@@ -120,6 +235,8 @@ class LlamaCppManager:
             }
             params.update(kwargs)
 
+            self._ensure_context(prompt, max_tokens)
+
             # Generate response
             output = self._loaded_model.create_completion(prompt=prompt, **params)
 
@@ -132,5 +249,60 @@ class LlamaCppManager:
             return response_text.strip()
 
         except Exception as e:
-            logger.error(f"LLM generation error: {str(e)}")
+            logger.error("LLM generation error: %s", e)
             return ""
+
+    def generate_stream(
+        self,
+        prompt: str = "",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Generate text using a LLaMa model, yielding it as it is decoded.
+
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            top_p: Top-p sampling parameter
+            **kwargs: Additional parameters for model.create_completion
+
+        Yields:
+            Chunks of generated text; generation errors are logged and end the stream
+        """
+        params = {
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stop": kwargs.pop("stop", []),
+        }
+        params.update(kwargs)
+
+        try:
+            self._ensure_context(prompt, max_tokens)
+
+            for chunk in self._loaded_model.create_completion(prompt=prompt, stream=True, **params):
+                text = chunk["choices"][0]["text"]
+                if text:
+                    yield text
+        except Exception as e:
+            logger.error("LLM streaming generation error: %s", e)
+
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """
+        Generate text for several prompts with the loaded model.
+
+        Prompts that share a prefix (e.g. the same system prompt) reuse the
+        cached KV state, so only the differing suffix is evaluated.
+
+        Args:
+            prompts: Input prompts
+            **kwargs: Generation parameters passed to generate()
+
+        Returns:
+            Generated text for each prompt, in order
+        """
+        return [self.generate(prompt=prompt, **kwargs) for prompt in prompts]
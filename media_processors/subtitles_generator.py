@@ -4,12 +4,17 @@ subtitles_generator.py - Generates styled ASS subtitles from transcript with tim
 
 import json
 import logging
+import os
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from types import MappingProxyType
+from typing import Any, List, Mapping, Union
 
+import numpy as np
 import pysubs2
 
-from media_processors.whisper_align import Segment
+from media_processors.whisper_align import Segment, Segments
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,33 @@ DEFAULT_STYLE = {
 }
 
 
+@lru_cache(maxsize=8)
+def _load_style(style_path: str, mtime: float) -> Mapping[str, Any]:
+    """
+    Load a style configuration file merged over the default style.
+
+    Results are cached per (path, modification time), so an edited file is
+    picked up while unchanged files are only parsed once per process.
+
+    Args:
+        style_path: Path to the style configuration file
+        mtime: Modification time of the file, used as part of the cache key
+
+    Returns:
+        Read-only mapping with the resolved style
+    """
+    try:
+        with open(style_path, "r", encoding="utf-8") as f:
+            custom_style = json.load(f)
+    except Exception as e:
+        logger.error("Error loading style config from %s: %s", style_path, e)
+        logger.warning("Using default style configuration")
+        return MappingProxyType(DEFAULT_STYLE)
+
+    # Custom settings take precedence; missing keys fall through to the defaults
+    return MappingProxyType(ChainMap(custom_style, DEFAULT_STYLE))
+
+
 class SubtitlesGenerator:
     """Generates styled .ass subtitles from aligned transcript segments."""
 
@@ -47,12 +79,12 @@ class SubtitlesGenerator:
         # If style_path is provided and file exists, load it
         if style_path and Path(style_path).exists():
             self._load_style_config(style_path)
-            logger.info(f"Loaded custom style from {style_path}")
+            logger.info("Loaded custom style from %s", style_path)
         else:
             # Use default style only when file doesn't exist
-            self.style_config = DEFAULT_STYLE.copy()
+            self.style_config = MappingProxyType(DEFAULT_STYLE)
             if style_path:
-                logger.warning(f"Style file not found: {style_path}. Using default style.")
+                logger.warning("Style file not found: %s. Using default style.", style_path)
             else:
                 logger.info("No style path provided. Using default style.")
 
@@ -60,24 +92,12 @@ class SubtitlesGenerator:
 
     def _load_style_config(self, style_path: str):
         """
-        Load custom style configuration from JSON file.
+        Load custom style configuration from JSON file (cached per modification time).
 
         Args:
             style_path: Path to the style configuration file
         """
-        try:
-            with open(style_path, "r", encoding="utf-8") as f:
-                custom_style = json.load(f)
-
-            # Update default style with custom settings
-            self.style_config = DEFAULT_STYLE.copy()
-            self.style_config.update(custom_style)
-            logger.info(f"Loaded custom style from {style_path}")
-
-        except Exception as e:
-            logger.error(f"Error loading style config from {style_path}: {str(e)}")
-            logger.warning("Using default style configuration")
-            self.style_config = DEFAULT_STYLE.copy()
+        self.style_config = _load_style(style_path, os.path.getmtime(style_path))
 
     def _create_style(self, subs: pysubs2.SSAFile) -> str:
         """
@@ -116,16 +136,31 @@ class SubtitlesGenerator:
 
         return style_name
 
-    def generate(self, aligned_transcript: List[Segment], output_path: str, each_word: bool = False):
+    def generate(
+        self, aligned_transcript: Union[List[Segment], Segments], output_path: str, each_word: bool = False
+    ):
         """
         Generate ASS subtitle file from aligned transcript segments.
 
         Args:
-            aligned_transcript: List of aligned transcript segments
+            aligned_transcript: Aligned transcript segments, as a list or column-wise
             output_path: Output subtitle file path
             each_word: If True, generate timestamps for each word instead of segments
         """
-        logger.info(f"Generating ASS subtitles with {len(aligned_transcript)} segments, each_word={each_word}")
+        # Segment (start_ms, end_ms, text) rows; column-wise input converts in one pass
+        if isinstance(aligned_transcript, Segments):
+            rows = list(zip(
+                (aligned_transcript.start * 1000).astype(np.int64).tolist(),
+                (aligned_transcript.end * 1000).astype(np.int64).tolist(),
+                aligned_transcript.text,
+            ))
+        else:
+            rows = [
+                (int(segment.start * 1000), int(segment.end * 1000), segment.text)
+                for segment in aligned_transcript
+            ]
+
+        logger.info("Generating ASS subtitles with %s segments, each_word=%s", len(rows), each_word)
 
         # Create a new subtitle file
         subs = pysubs2.SSAFile()
@@ -134,26 +169,19 @@ class SubtitlesGenerator:
         style_name = self._create_style(subs)
 
         if not each_word:
-            # Standard mode: Add events (subtitle lines) from aligned transcript
-            for segment in aligned_transcript:
-                start_time = int(segment.start * 1000)  # Convert to milliseconds
-                end_time = int(segment.end * 1000)  # Convert to milliseconds
-
-                # Create subtitle event
-                event = pysubs2.SSAEvent(start=start_time, end=end_time, text=segment.text, style=style_name)
-
-                # Add event to subtitle file
-                subs.events.append(event)
+            # Standard mode: Add events (subtitle lines) from aligned transcript, times in milliseconds
+            subs.events.extend([
+                pysubs2.SSAEvent(start=start, end=end, text=text, style=style_name)
+                for start, end, text in rows
+            ])
         else:
             # Word-by-word mode with improved timing based on character length
-            for segment in aligned_transcript:
+            for segment_start_ms, segment_end_ms, text in rows:
                 # Get segment duration in milliseconds
-                segment_start_ms = int(segment.start * 1000)
-                segment_end_ms = int(segment.end * 1000)
                 segment_duration = segment_end_ms - segment_start_ms
 
                 # Split segment text into words
-                words = segment.text.split()
+                words = text.split()
                 if not words:
                     continue
 
@@ -164,30 +192,21 @@ class SubtitlesGenerator:
 
                 ms_per_char = segment_duration / total_chars
 
-                # Create a subtitle event for each word with proportional timing
-                current_time = segment_start_ms
-                for i, word in enumerate(words):
-                    word_duration = int(len(word) * ms_per_char)
-
-                    # Ensure minimum duration
-                    word_duration = max(word_duration, 100)  # At least 100ms per word
-
-                    word_start = current_time
-                    word_end = current_time + word_duration
-
-                    # Ensure the last word ends exactly at segment end
-                    if i == len(words) - 1:
-                        word_end = segment_end_ms
-
-                    # Create subtitle event
-                    event = pysubs2.SSAEvent(start=word_start, end=word_end, text=word, style=style_name)
+                # Word durations proportional to length, at least 100ms per word
+                lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+                durations = np.maximum((lengths * ms_per_char).astype(np.int64), 100)
+                word_ends = segment_start_ms + np.cumsum(durations)
+                word_starts = word_ends - durations
 
-                    # Add event to subtitle file
-                    subs.events.append(event)
+                # Ensure the last word ends exactly at segment end
+                word_ends[-1] = segment_end_ms
 
-                    # Update current time position
-                    current_time = word_end
+                # Create a subtitle event for each word
+                subs.events.extend([
+                    pysubs2.SSAEvent(start=start, end=end, text=word, style=style_name)
+                    for start, end, word in zip(word_starts.tolist(), word_ends.tolist(), words)
+                ])
 
         # Save to file
         subs.save(output_path)
-        logger.info(f"Subtitles saved to {output_path}")
+        logger.info("Subtitles saved to %s", output_path)
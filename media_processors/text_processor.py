@@ -2,7 +2,8 @@
 ai_text_processor.py - AI-powered text processing for summarization and content splitting
 """
 import logging
-from typing import Optional
+import re
+from typing import Iterator, Optional, Tuple
 
 # Check for llama-cpp-python via our manager
 try:
@@ -12,6 +13,39 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Trailing notes/comments the model sometimes appends after the script
+_NOTE_RE = re.compile(r"\n\n(?:\(Note:|Note:|\[Note:|--|Word count:).*", re.IGNORECASE | re.DOTALL)
+# Parenthetical stage directions like "(sighs)", "(laughs)"
+_STAGE_DIRECTION_RE = re.compile(r"\(\s*[a-zA-Z\s']+\s*\)")
+# Words worth emphasizing when the model didn't add any emphasis itself
+_EMPH_RE = re.compile(r"\b(?:crazy|insane|wild|suddenly|shocking|unbelievable)\b", re.IGNORECASE)
+# Phrases that get a dramatic pause in front of them
+_PAUSE_RE = re.compile(r"but then|suddenly|that's when|and then")
+# System prompt for summarize_text; identical across calls with the same target length
+_SYSTEM_PROMPT_TEMPLATE = (
+    "You are an expert TikTok script writer who creates viral-worthy content. "
+    "You specialize in summarizing stories into short, engaging scripts using "
+    "casual slang and creating a cliffhanger ending. "
+    "CRITICAL: Scripts MUST be under {word_count_limit} words total to fit within {length} seconds. "
+    "Keep it concise, authentic, and emotionally engaging. "
+    "Maintain first-person perspective when appropriate. "
+    "Include internet slang like 'vibin', 'sus', 'lowkey', etc. Make it sound like "
+    "someone casually telling a wild story to their friends, with lots of energy "
+    "and emphasis on surprising or dramatic moments. "
+    "Do not include parenthetical stage directions like (sighs), (laughs), or similar"
+)
+# Fixed style rules for summarize_text's user prompt (first person, slang and the
+# storytelling voice are already required by the system prompt)
+_PROMPT_RULES = (
+    "Use short punchy sentences.",
+    "Start with phrases that engages the audience",
+    "Do not use hash tags, emojis, or any additional comments or notes.",
+)
+# Stop decoding where the trailing notes stripped by _NOTE_RE would begin
+_SUMMARY_STOP = ["\n\n(Note", "\n\nNote:", "\n\n[Note:", "\n\nWord count:"]
+# Whitespace after sentence-ending punctuation, where streamed scripts are split
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 class AITextProcessor:
     """AI-powered text processor for summarizing and splitting content."""
@@ -34,8 +68,7 @@ class AITextProcessor:
     def _speech_seconds_to_max_tokens(self, speech_seconds: float, words_per_minute: int = 150) -> int:
         words_per_second = words_per_minute / 60.0               # Convert to words/sec
         tokens_per_word = 1.33                                   # Approximate GPT: 1 word ≈ 1.33 tokens
-        buffer_factor = 1.2
-        estimated_tokens = speech_seconds * words_per_second * tokens_per_word * buffer_factor
+        estimated_tokens = speech_seconds * words_per_second * tokens_per_word
         return int(estimated_tokens)
 
     def summarize_text(
@@ -46,23 +79,122 @@ class AITextProcessor:
         tone: str = "casual",
         length: int = 30,
         theme: Optional[str] = None,
+        deterministic: bool = False,
     ) -> str:
+        """
+        Summarize a story into a short narration script.
+
+        Args:
+            datasource: Name of the source the story came from (e.g. "reddit")
+            text: Story text to summarize
+            style: Script style
+            tone: Tone the script should use
+            length: Target speech length in seconds
+            theme: Optional theme to flavor the story with
+            deterministic: Use greedy decoding for repeatable (and slightly faster) output
+
+        Returns:
+            The script, an empty string for empty input, or None if generation failed
+        """
+        if not text or not text.strip():
+            return ""
+
+        formatted_prompt, max_output_tokens = self._summary_prompt(datasource, text, style, tone, length, theme)
+
+        try:
+            response = self._llm_manager.generate(prompt=formatted_prompt,
+                                                  max_tokens=max_output_tokens,
+                                                  stop=_SUMMARY_STOP,
+                                                  **self._summary_sampling(deterministic))
+
+            # Format response for better readability
+            response = self._format_summarized_text(response)
+
+            return response
+        except Exception as e:
+            logger.error("Error in summarize_text: %s", e)
+            return None
+
+    def summarize_text_stream(
+        self,
+        datasource: str,
+        text: str,
+        style: str = "tiktok",
+        tone: str = "casual",
+        length: int = 30,
+        theme: Optional[str] = None,
+        deterministic: bool = False,
+    ) -> Iterator[str]:
+        """
+        Summarize a story like summarize_text, yielding the script a sentence at a time.
+
+        Sentences are yielded as soon as the model finishes them, so speech can be
+        synthesized while the rest is still being generated. Each one gets the same
+        clean-up as summarize_text; the emphasis and pause heuristics are judged per
+        sentence because the full script isn't known yet.
+
+        Args:
+            datasource: Name of the source the story came from (e.g. "reddit")
+            text: Story text to summarize
+            style: Script style
+            tone: Tone the script should use
+            length: Target speech length in seconds
+            theme: Optional theme to flavor the story with
+            deterministic: Use greedy decoding for repeatable (and slightly faster) output
+
+        Yields:
+            Sentences of the script; nothing for empty input or if generation failed
+        """
+        if not text or not text.strip():
+            return
+
+        formatted_prompt, max_output_tokens = self._summary_prompt(datasource, text, style, tone, length, theme)
+
+        chunks = self._llm_manager.generate_stream(prompt=formatted_prompt,
+                                                   max_tokens=max_output_tokens,
+                                                   stop=_SUMMARY_STOP,
+                                                   **self._summary_sampling(deterministic))
+        pending = ""
+        for chunk in chunks:
+            pending += chunk
+            # The last piece may still be growing; keep it until more text arrives
+            *complete, pending = _SENTENCE_END_RE.split(pending)
+            for sentence in complete:
+                sentence = self._format_streamed_sentence(sentence)
+                if sentence:
+                    yield sentence
+
+        sentence = self._format_streamed_sentence(pending)
+        if sentence:
+            yield sentence
+
+    def _format_streamed_sentence(self, sentence: str) -> str:
+        """Clean up one streamed sentence; a pause added at its start has nothing to follow."""
+        return self._format_summarized_text(sentence).lstrip(", ")
+
+    def _summary_prompt(
+        self,
+        datasource: str,
+        text: str,
+        style: str,
+        tone: str,
+        length: int,
+        theme: Optional[str],
+    ) -> Tuple[str, int]:
+        """Build the summarization prompt and its token budget for summarize_text(_stream)."""
         # Calculate maximum tokens based on speech duration
         max_output_tokens = self._speech_seconds_to_max_tokens(length)
 
         # Calculate approximate word count for prompt clarity (about 150 words per minute)
         word_count_limit = int((length / 60) * 150)
 
+        # Keep the per-story parts (tone, theme, text) at the end so the shared
+        # prefix is served from the model's prompt cache on repeat calls
         prompt_parts = [
             f"Summarize this {datasource} story into a {length} seconds {style} script.",
-            f"Use {tone} tone.",
             f"IMPORTANT: The script MUST be under {word_count_limit} words to fit in {length} seconds.",
-            "Use first-person perspective, casual slang, and short punchy sentences.",
-            "Start with phrases that engages the audience",
-            "Use modern internet slang where appropriate.",
-            "Make it sound like someone's telling a story to their friends.",
-            "Do not use hash tags or emojis.",
-            "Do not include any additional comments or notes.",
+            *_PROMPT_RULES,
+            f"Use {tone} tone.",
         ]
 
         if theme:
@@ -72,79 +204,33 @@ class AITextProcessor:
         prompt_parts.append(text)
         prompt_parts.append("\nSUMMARIZED SCRIPT:")
 
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are an expert TikTok script writer who creates viral-worthy content. "
-                    "You specialize in summarizing stories into short, engaging scripts using "
-                    "casual slang and creating a cliffhanger ending. "
-                    f"CRITICAL: Scripts MUST be under {word_count_limit} words total to fit within {length} seconds. "
-                    "Keep it concise, authentic, and emotionally engaging. "
-                    "Maintain first-person perspective when appropriate. "
-                    "Include internet slang like 'vibin', 'sus', 'lowkey', etc. Make it sound like "
-                    "someone casually telling a wild story to their friends, with lots of energy "
-                    "and emphasis on surprising or dramatic moments. "
-                    "Do not include parenthetical stage directions like (sighs), (laughs), or similar"
-                ),
-            },
-            {"role": "user", "content": "\n".join(prompt_parts)},
-        ]
+        system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(word_count_limit=word_count_limit, length=length)
+        user_prompt = "\n".join(prompt_parts)
+        return f"SYSTEM: {system_prompt}\n\nUSER: {user_prompt}\n\n", max_output_tokens
 
-        # Convert the messages list into a properly formatted string for the model
-        formatted_prompt = ""
-        for msg in messages:
-            role = msg["role"]
-            content = msg["content"]
-            formatted_prompt += f"{role.upper()}: {content}\n\n"
-
-        try:
-            response = self._llm_manager.generate(prompt=formatted_prompt,
-                                                  max_tokens=max_output_tokens,
-                                                  temperature=0.7,
-                                                  top_p=0.9)
-
-            # Format response for better readability
-            response = self._format_summarized_text(response)
-
-            return response
-        except Exception as e:
-            logger.error(f"Error in summarize_text: {e}")
-            return None
+    @staticmethod
+    def _summary_sampling(deterministic: bool) -> dict:
+        """Sampling parameters for summaries: greedy when deterministic output is wanted."""
+        return {"temperature": 0.0, "top_k": 1} if deterministic else {"temperature": 0.7, "top_p": 0.9}
 
     def _format_summarized_text(self, text: str) -> str:
         # Clean up the text first - remove any ASSISTANT: prefix that might be included
-        if text.upper().startswith("ASSISTANT:"):
+        if text[:10].upper() == "ASSISTANT:":
             text = text[len("ASSISTANT:"):].strip()
 
         # Remove any note or comment lines that appear at the end
-        note_patterns = [
-            r"\n\n\(Note:.*",  # Matches "(Note: ..." at the end
-            r"\n\nNote:.*",  # Matches "Note: ..." at the end
-            r"\n\n\[Note:.*",  # Matches "[Note: ..." at the end
-            r"\n\n--.*",  # Matches "--" at the end
-            r"\n\nWord count:.*",  # Matches "Word count: ..." at the end
-            r"\(\s*[a-zA-Z\s']+\s*\)"  # Matches any parenthetical comments like "(sighs)", "(laughs)", etc.
-        ]
-
-        import re
-        for pattern in note_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE | re.DOTALL)
+        text = _NOTE_RE.sub("", text)
+        text = _STAGE_DIRECTION_RE.sub("", text)
 
         # Enhance emphasis markers if needed
         if '*' not in text:
             # Try to add emphasis to important words
-            for word in ['crazy', 'insane', 'wild', 'suddenly', 'shocking', 'unbelievable']:
-                if word in text.lower():
-                    text = text.replace(word, f"*{word}*")
-                    text = text.replace(word.capitalize(), f"*{word.capitalize()}*")
+            text = _EMPH_RE.sub(lambda m: f"*{m.group(0)}*", text)
 
         # Ensure dramatic pauses
         if ',' not in text:
-            # Add ellipses for dramatic effect before climactic parts
-            for phrase in ['but then', 'suddenly', 'that\'s when', 'and then']:
-                if phrase in text.lower():
-                    text = text.replace(phrase, f", {phrase}")
+            # Add a comma before climactic parts
+            text = _PAUSE_RE.sub(lambda m: f", {m.group(0)}", text)
 
         return text.strip()
 
@@ -211,5 +297,5 @@ Answer with only the category name:"""
             return response
 
         except Exception as e:
-            logger.error(f"Error in sentiment analysis: {e}")
+            logger.error("Error in sentiment analysis: %s", e)
             return None
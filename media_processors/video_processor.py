@@ -1,214 +1,233 @@
 """
 video_processor.py - Processes video with subtitles using ffmpeg
 """
+import asyncio
 import logging
 import os
+import shutil
 import subprocess
-import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Try to import PyAV for in-process container probing
+try:
+    import av
+
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# Probed media durations keyed by (absolute path, mtime_ns, size), shared by all instances
+_DURATION_CACHE: Dict[Tuple[str, int, int], float] = {}
+
 
 class VideoProcessor:
     """Processes video files and burns subtitles into them."""
 
-    def __init__(self):
-        """Initialize the VideoProcessor."""
+    # Environment probes are run once per interpreter and shared by all instances
+    _probe_lock = threading.Lock()
+    _ffmpeg_checked = False
+    _nvenc_detected: Optional[bool] = None
+
+    def __init__(self, preset: str = "veryfast", crf: int = 20, max_concurrent_ffmpeg: Optional[int] = None):
+        """
+        Initialize the VideoProcessor.
+
+        Args:
+            preset: libx264 preset used when encoding in software (speed/size tradeoff)
+            crf: libx264 quality setting (lower is better, 18-28 is a good range)
+            max_concurrent_ffmpeg: Limit on ffmpeg processes run at once by the *_async
+                                   methods (default: half the CPU count)
+        """
         logger.debug("Initializing VideoProcessor")
+        self.preset = preset
+        self.crf = crf
+        self.max_concurrent_ffmpeg = max_concurrent_ffmpeg or max(1, (os.cpu_count() or 2) // 2)
+        self._ffmpeg_semaphore: Optional[asyncio.Semaphore] = None
         self._check_ffmpeg()
+        self._nvenc_available = self._detect_nvenc()
 
     def _check_ffmpeg(self):
-        """Check if ffmpeg is installed and available."""
+        """Check if ffmpeg is installed and available (once per process)."""
+        if VideoProcessor._ffmpeg_checked:
+            return
+
+        with VideoProcessor._probe_lock:
+            if VideoProcessor._ffmpeg_checked:
+                return
+            # A PATH lookup is enough; no need to spawn ffmpeg just to see it exists
+            if shutil.which("ffmpeg") is None:
+                logger.error("ffmpeg is not installed or not in PATH")
+                raise RuntimeError(
+                    "ffmpeg is required but not found. Please install ffmpeg and make sure it's in your PATH."
+                )
+            logger.debug("ffmpeg is available")
+            VideoProcessor._ffmpeg_checked = True
+
+    @staticmethod
+    def _ensure_dir(path: str):
+        """Create the parent directory of path if it doesn't exist yet."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _detect_nvenc(self) -> bool:
+        """Check whether this ffmpeg build ships the h264_nvenc encoder (once per process)."""
+        if VideoProcessor._nvenc_detected is None:
+            with VideoProcessor._probe_lock:
+                if VideoProcessor._nvenc_detected is None:
+                    VideoProcessor._nvenc_detected = self._probe_nvenc()
+        return VideoProcessor._nvenc_detected
+
+    def _probe_nvenc(self) -> bool:
+        """Ask ffmpeg whether the h264_nvenc encoder is compiled in."""
         try:
-            subprocess.run(
-                ["ffmpeg", "-version"],
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
                 check=True,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
             )
-            logger.debug("ffmpeg is available")
         except (subprocess.SubprocessError, FileNotFoundError):
-            logger.error("ffmpeg is not installed or not in PATH")
-            raise RuntimeError(
-                "ffmpeg is required but not found. Please install ffmpeg and make sure it's in your PATH."
-            )
-
-    def _copy_video(self, video_path: str, output_path: str) -> str:
-        """Copy a video file."""
-        logger.debug(f"Copying video from {video_path} to {output_path}")
-
-        # Ensure the output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+            return False
 
-        # Use ffmpeg to copy the video without re-encoding
-        cmd = [
-            "ffmpeg",
-            "-i",
-            video_path,
-            "-c",
-            "copy",
-            output_path,
-            "-y",
-        ]
+        available = b"h264_nvenc" in result.stdout
+        logger.debug("NVENC encoder available: %s", available)
+        return available
 
-        try:
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.debug(f"Video copied to {output_path}")
-            return output_path
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error copying video: {e.stderr}")
-            raise RuntimeError(f"Failed to copy video: {str(e)}")
+    @staticmethod
+    def _quiet_ffmpeg_command(cmd: List[str]) -> List[str]:
+        """Add -loglevel error -nostats so stderr only carries real errors."""
+        return [cmd[0], "-hide_banner", "-loglevel", "error", "-nostats", *cmd[1:]]
 
-    def _trim_video(self, video_path: str, target_duration: float, output_path: str) -> str:
+    def _run_ffmpeg(self, cmd: List[str]):
         """
-        Trim a video to the specified duration.
+        Run an ffmpeg command, keeping only its error output.
 
-        Args:
-            video_path: Path to the input video
-            target_duration: Target duration in seconds
-            output_path: Path for the output video
+        stderr only carries real errors so the pipe stays small; stdout is
+        discarded. Raises CalledProcessError on failure.
+        """
+        subprocess.run(
+            self._quiet_ffmpeg_command(cmd),
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    async def _run_ffmpeg_async(self, cmd: List[str]):
+        """
+        Run an ffmpeg command without blocking the event loop.
 
-        Returns:
-            Path to the trimmed video
+        At most max_concurrent_ffmpeg commands run at once per processor. Raises
+        CalledProcessError on failure, like _run_ffmpeg.
         """
-        logger.debug(f"Trimming video to {target_duration} seconds")
+        # Created lazily so it binds to the running event loop
+        if self._ffmpeg_semaphore is None:
+            self._ffmpeg_semaphore = asyncio.Semaphore(self.max_concurrent_ffmpeg)
+
+        full_cmd = self._quiet_ffmpeg_command(cmd)
+        async with self._ffmpeg_semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *full_cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
 
-        # Ensure the output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, full_cmd, stderr=stderr)
 
-        # Use ffmpeg to trim the video
-        cmd = [
-            "ffmpeg",
-            "-i",
-            video_path,
-            "-t",
-            str(target_duration),
-            "-c:v",
-            "libx264",
-            "-c:a",
-            "aac",
-            "-strict",
-            "experimental",
-            output_path,
-            "-y",
-        ]
+    def _encode_commands(self, build_command: Callable[[bool], List[str]]) -> List[List[str]]:
+        """Commands to try in order for an encode: NVENC first when available, then libx264."""
+        if self._nvenc_available:
+            return [build_command(True), build_command(False)]
+        return [build_command(False)]
 
-        try:
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.debug(f"Video trimmed to {target_duration} seconds: {output_path}")
-            return output_path
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error trimming video: {e.stderr}")
-            raise RuntimeError(f"Failed to trim video: {str(e)}")
+    def _run_encode(self, commands: List[List[str]]):
+        """Run the first encode command that succeeds; raises CalledProcessError if all fail."""
+        for cmd in commands[:-1]:
+            try:
+                self._run_ffmpeg(cmd)
+                return
+            except subprocess.CalledProcessError as e:
+                # e.g. no usable GPU at runtime despite an NVENC-enabled build
+                logger.warning("NVENC encode failed, falling back to libx264: %s", e.stderr.decode())
+        self._run_ffmpeg(commands[-1])
+
+    async def _run_encode_async(self, commands: List[List[str]]):
+        """Async counterpart of _run_encode."""
+        for cmd in commands[:-1]:
+            try:
+                await self._run_ffmpeg_async(cmd)
+                return
+            except subprocess.CalledProcessError as e:
+                logger.warning("NVENC encode failed, falling back to libx264: %s", e.stderr.decode())
+        await self._run_ffmpeg_async(commands[-1])
 
-    def _extend_video(self, video_path: str, target_duration: float, output_path: str) -> str:
+    def _probe_duration_av(self, video_path: str):
         """
-        Extend a video to the specified duration by looping the video content.
+        Read the container duration in-process with PyAV.
 
         Args:
-            video_path: Path to the input video
-            target_duration: Target duration in seconds
-            output_path: Path for the output video
+            video_path: Path to the media file
 
         Returns:
-            Path to the extended video
+            Duration in seconds, or None if it could not be determined
         """
-        logger.debug(f"Extending video to {target_duration} seconds")
-
-        # Get original duration
-        original_duration = self.get_media_duration(video_path)
-
-        # Ensure the output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        try:
+            with av.open(video_path) as container:
+                if container.duration is None:
+                    return None
+                return float(container.duration) / av.time_base
+        except (av.error.FFmpegError, OSError) as e:
+            logger.debug("PyAV probe failed for %s: %s", video_path, e)
+            return None
 
-        # Create a temporary directory for processing
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Calculate how many times we need to loop the video
-            loops_needed = int(target_duration / original_duration) + 1
-            remaining_duration = target_duration % original_duration
+    def get_media_duration(self, video_path: str) -> float:
+        """
+        Get the duration of a media file (mp3, mp4, wav).
 
-            # Make a copy of the original video to the temporary directory
-            local_video_path = os.path.join(temp_dir, "original_video.mp4")
-            self._copy_video(video_path, local_video_path)
+        Uses PyAV when installed to avoid spawning a process, and falls back
+        to ffprobe otherwise. Results are cached per file path, modification
+        time and size.
 
-            try:
-                # Create a file list for concatenation
-                concat_file = os.path.join(temp_dir, "concat.txt")
-                with open(concat_file, "w") as f:
-                    # Add the complete loops
-                    for _ in range(loops_needed - 1):
-                        f.write(f"file '{local_video_path}'\n")
-
-                    # Handle the remaining partial loop if needed
-                    if remaining_duration > 0.1:  # Only if we need a significant chunk
-                        # Create a trimmed version of the original for the remaining duration
-                        trimmed_path = os.path.join(temp_dir, "trimmed.mp4")
-                        trim_cmd = [
-                            "ffmpeg",
-                            "-i",
-                            local_video_path,
-                            "-t",
-                            str(remaining_duration),
-                            "-c:v",
-                            "libx264",
-                            "-c:a",
-                            "aac",
-                            "-strict",
-                            "experimental",
-                            trimmed_path,
-                            "-y",
-                        ]
-
-                        subprocess.run(trim_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                        f.write(f"file '{trimmed_path}'\n")
-                    else:
-                        # Add one more complete copy if the remaining time is too short
-                        f.write(f"file '{local_video_path}'\n")
-
-                # Concatenate all the video segments
-                concat_cmd = [
-                    "ffmpeg",
-                    "-f",
-                    "concat",
-                    "-safe",
-                    "0",
-                    "-i",
-                    concat_file,
-                    "-c:v",
-                    "libx264",
-                    "-c:a",
-                    "aac",
-                    "-strict",
-                    "experimental",
-                    output_path,
-                    "-y",
-                ]
-
-                subprocess.run(concat_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                logger.debug(f"Video extended to {target_duration} seconds by looping: {output_path}")
-                return output_path
+        Args:
+            video_path: Path to the video file(mp3, mp4, wav)
 
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Error extending video: {e.stderr}")
-                raise RuntimeError(f"Failed to extend video: {str(e)}")
+        Returns:
+            Duration of the video in seconds
+        """
+        logger.debug("Getting duration of video: %s", video_path)
 
-    def get_media_duration(self, video_path: str) -> float:
+        # A file that hasn't changed since the last probe keeps its duration
+        try:
+            st = os.stat(video_path)
+            cache_key = (os.path.abspath(video_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+        if cache_key in _DURATION_CACHE:
+            return _DURATION_CACHE[cache_key]
+
+        duration = self._probe_duration(video_path)
+        if cache_key is not None:
+            _DURATION_CACHE[cache_key] = duration
+        return duration
+
+    def _probe_duration(self, video_path: str) -> float:
         """
-        Get the duration of a media file using ffprobe(mp3, mp4, wav).
+        Probe the duration of a media file, without caching.
 
         Args:
-            video_path: Path to the video file(mp3, mp4, wav)
+            video_path: Path to the media file
 
         Returns:
-            Duration of the video in seconds
+            Duration in seconds
         """
-        logger.debug(f"Getting duration of video: {video_path}")
+        if AV_AVAILABLE:
+            duration = self._probe_duration_av(video_path)
+            if duration is not None:
+                logger.debug("Video duration: %s seconds", duration)
+                return duration
 
         # Use ffprobe to get the duration
         cmd = [
@@ -227,19 +246,23 @@ class VideoProcessor:
                 cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
             )
             duration = float(result.stdout.strip())
-            logger.debug(f"Video duration: {duration} seconds")
+            logger.debug("Video duration: %s seconds", duration)
             return duration
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error getting video duration: {e.stderr}")
+            logger.error("Error getting video duration: %s", e.stderr)
             raise RuntimeError(f"Failed to get video duration: {str(e)}")
         except ValueError as e:
-            logger.error(f"Invalid duration value: {e}")
+            logger.error("Invalid duration value: %s", e)
             raise RuntimeError(f"Failed to parse video duration: {str(e)}")
 
     def adjust_video_duration(self, video_path: str, target_duration: float, output_path: str) -> str:
         """
         Adjust the duration of a video to match the target duration.
-        The video will be trimmed or extended as needed.
+        The video will be trimmed or extended (by looping) as needed.
+
+        A single stream-copy ffmpeg pass handles both cases: -stream_loop only
+        kicks in when -t reaches past the end of the input, so the input never
+        needs to be probed first.
 
         Args:
             video_path: Path to the input video
@@ -249,23 +272,46 @@ class VideoProcessor:
         Returns:
             Path to the adjusted video
         """
-        # Get the current duration of the video
-        current_duration = self.get_media_duration(video_path)
+        logger.debug("Adjusting video %s to %s seconds", video_path, target_duration)
+
+        # Ensure the output directory exists
+        self._ensure_dir(output_path)
 
-        # If durations are close enough, just copy the video
-        if abs(current_duration - target_duration) < 0.5:
-            logger.debug(f"Video duration ({current_duration}s) already matches target ({target_duration}s)")
-            if video_path != output_path:
-                self._copy_video(video_path, output_path)
+        try:
+            self._run_ffmpeg(self._adjust_command(video_path, target_duration, output_path))
+            logger.debug("Video adjusted to %s seconds: %s", target_duration, output_path)
             return output_path
+        except subprocess.CalledProcessError as e:
+            logger.error("Error adjusting video duration: %s", e.stderr)
+            raise RuntimeError(f"Failed to adjust video duration: {str(e)}")
 
-        # Check if we need to trim or extend
-        if current_duration > target_duration:
-            # Need to trim the video
-            return self._trim_video(video_path, target_duration, output_path)
-        else:
-            # Need to extend the video
-            return self._extend_video(video_path, target_duration, output_path)
+    async def adjust_video_duration_async(self, video_path: str, target_duration: float, output_path: str) -> str:
+        """Async version of adjust_video_duration."""
+        self._ensure_dir(output_path)
+
+        try:
+            await self._run_ffmpeg_async(self._adjust_command(video_path, target_duration, output_path))
+            logger.debug("Video adjusted to %s seconds: %s", target_duration, output_path)
+            return output_path
+        except subprocess.CalledProcessError as e:
+            logger.error("Error adjusting video duration: %s", e.stderr)
+            raise RuntimeError(f"Failed to adjust video duration: {str(e)}")
+
+    def _adjust_command(self, video_path: str, target_duration: float, output_path: str) -> List[str]:
+        """Build the stream-copy command that loops or cuts a video to target_duration."""
+        return [
+            "ffmpeg",
+            "-stream_loop",
+            "-1",
+            "-i",
+            video_path,
+            "-t",
+            str(target_duration),
+            "-c",
+            "copy",
+            output_path,
+            "-y",
+        ]
 
     def replace_audio(self, video_path: str, audio_path: str, output_path: str) -> str:
         """
@@ -279,12 +325,10 @@ class VideoProcessor:
         Returns:
             Path to the output video with replaced audio
         """
-        logger.debug(f"Replacing audio in video {video_path} with {audio_path}")
+        logger.debug("Replacing audio in video %s with %s", video_path, audio_path)
 
         # Ensure the output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        self._ensure_dir(output_path)
 
         # Prepare ffmpeg command
         ffmpeg_cmd = [
@@ -308,57 +352,430 @@ class VideoProcessor:
 
         try:
             # Run ffmpeg command
-            subprocess.run(ffmpeg_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.debug(f"Video with replaced audio created: {output_path}")
+            self._run_ffmpeg(ffmpeg_cmd)
+            logger.debug("Video with replaced audio created: %s", output_path)
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error replacing audio: {e.stderr}")
+            logger.error("Error replacing audio: %s", e.stderr)
             raise RuntimeError(f"Failed to replace audio in video: {str(e)}")
 
-    def burn_subtitles(self, video_path: str, subtitle_path: str, output_path: str):
+    def _input_hwaccel_args(self) -> List[str]:
         """
-        Burn subtitles into video using ffmpeg.
+        Input options that let ffmpeg decode with whatever hardware decoder is available.
+
+        Only useful for commands that actually decode video; stream-copy commands
+        never touch the decoder and don't need them. Decoded frames are returned in
+        system memory, so CPU filters and encoders work unchanged.
+        """
+        return ["-hwaccel", "auto"]
+
+    def _nvenc_burn_command(self, video_path: str, subtitle_path: str, output_path: str) -> List[str]:
+        """
+        Build the ffmpeg command that burns subtitles with NVDEC decode and NVENC encode.
+
+        libass only renders on the CPU, so frames are downloaded from the GPU for the
+        ass filter and uploaded again for the encoder.
+        """
+        return [
+            "ffmpeg",
+            "-hwaccel",
+            "cuda",
+            "-hwaccel_output_format",
+            "cuda",
+            "-i",
+            video_path,
+            "-vf",
+            f"hwdownload,format=nv12,ass={subtitle_path},hwupload_cuda",
+            "-c:a",
+            "copy",
+            "-c:v",
+            "h264_nvenc",
+            "-preset",
+            "p4",
+            "-tune",
+            "hq",
+            "-rc",
+            "vbr",
+            "-cq",
+            "19",
+            "-b:v",
+            "0",
+            output_path,
+            "-y",
+        ]
+
+    def _probe_video_format(self, video_path: str) -> Tuple[int, int, str]:
+        """
+        Probe the frame size and frame rate of the first video stream.
 
         Args:
-            video_path: Path to the input video
+            video_path: Path to the video file
+
+        Returns:
+            Tuple of (width, height, frame rate as an ffmpeg rational like "30000/1001")
+        """
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=width,height,r_frame_rate",
+            "-of",
+            "csv=p=0",
+            video_path,
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+            width, height, rate = result.stdout.strip().split(",")[:3]
+            return int(width), int(height), rate
+        except subprocess.CalledProcessError as e:
+            logger.error("Error probing video format: %s", e.stderr)
+            raise RuntimeError(f"Failed to probe video format: {str(e)}")
+        except ValueError as e:
+            logger.error("Invalid video format values: %s", e)
+            raise RuntimeError(f"Failed to parse video format: {str(e)}")
+
+    def render_subtitle_overlay(self, video_path: str, subtitle_path: str, overlay_path: str) -> str:
+        """
+        Render an .ass file to a transparent video matching the size, rate and length of video_path.
+
+        libass still runs on the CPU here, but only over a blank canvas, so the
+        overlay can be composited onto the video on the GPU afterwards.
+
+        Args:
+            video_path: Video the overlay will be composited onto
             subtitle_path: Path to the .ass subtitle file
-            output_path: Path for the output video with burned subtitles
+            overlay_path: Path for the overlay video (.mov, QuickTime Animation with alpha)
+
+        Returns:
+            Path to the overlay video
+        """
+        width, height, rate = self._probe_video_format(video_path)
+        duration = self.get_media_duration(video_path)
+        logger.debug("Rendering %sx%s@%s subtitle overlay to %s", width, height, rate, overlay_path)
+
+        cmd = [
+            "ffmpeg",
+            "-f",
+            "lavfi",
+            "-i",
+            f"color=c=black@0:s={width}x{height}:r={rate}:d={duration},format=rgba,ass={subtitle_path}",
+            "-c:v",
+            "qtrle",
+            "-pix_fmt",
+            "argb",
+            overlay_path,
+            "-y",
+        ]
+
+        try:
+            self._run_ffmpeg(cmd)
+            return overlay_path
+        except subprocess.CalledProcessError as e:
+            logger.error("Error rendering subtitle overlay: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to render subtitle overlay: {str(e)}")
+
+    def _overlay_burn_command(self, video_path: str, overlay_path: str, output_path: str) -> List[str]:
+        """
+        Build the command that composites a pre-rendered subtitle overlay with overlay_cuda.
+
+        Decoded frames stay in GPU memory from NVDEC through NVENC; only the
+        overlay itself is uploaded.
+        """
+        return [
+            "ffmpeg",
+            "-hwaccel",
+            "cuda",
+            "-hwaccel_output_format",
+            "cuda",
+            "-i",
+            video_path,
+            "-i",
+            overlay_path,
+            "-filter_complex",
+            "[1:v]format=yuva420p,hwupload_cuda[subs];[0:v][subs]overlay_cuda=shortest=1[v]",
+            "-map",
+            "[v]",
+            "-map",
+            "0:a?",
+            "-c:a",
+            "copy",
+            *self._video_encoder_args(True),
+            output_path,
+            "-y",
+        ]
+
+    def _burn_with_overlay(self, video_path: str, subtitle_path: str, output_path: str):
+        """Burn subtitles by pre-rendering them and compositing on the GPU; raises on failure."""
+        overlay_path = os.path.splitext(output_path)[0] + ".subs.mov"
+        try:
+            self.render_subtitle_overlay(video_path, subtitle_path, overlay_path)
+            self._run_ffmpeg(self._overlay_burn_command(video_path, overlay_path, output_path))
+        finally:
+            if os.path.exists(overlay_path):
+                os.remove(overlay_path)
+
+    def _video_encoder_args(self, use_nvenc: bool) -> List[str]:
+        """Output options for encoding the video stream with NVENC or libx264."""
+        if use_nvenc:
+            return ["-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "19", "-b:v", "0"]
+        return ["-c:v", "libx264", "-crf", str(self.crf), "-preset", self.preset, "-threads", "0"]
+
+    def process_pipeline(
+        self,
+        video_path: str,
+        output_path: str,
+        audio_path: Optional[str] = None,
+        subtitle_path: Optional[str] = None,
+        target_duration: Optional[float] = None,
+    ) -> str:
+        """
+        Loop, re-dub and subtitle a video in a single ffmpeg pass.
+
+        Equivalent to adjust_video_duration -> replace_audio -> burn_subtitles,
+        without the intermediate files or the extra decode/encode passes.
+
+        Args:
+            video_path: Path to the input video
+            output_path: Path for the output video
+            audio_path: Audio file to use as the soundtrack (optional)
+            subtitle_path: Path to an .ass subtitle file to burn in (optional)
+            target_duration: Loop the video and cut the output to this many seconds (optional)
+
+        Returns:
+            Path to the output video
         """
-        logger.debug(f"Burning subtitles into video: {video_path}")
-        logger.debug(f"Using subtitle file: {subtitle_path}")
+        logger.debug("Processing video %s in a single ffmpeg pass", video_path)
 
         # Ensure the output directory exists
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        self._ensure_dir(output_path)
 
-        # Prepare ffmpeg command
-        cmd = [
+        def build_command(use_nvenc: bool) -> List[str]:
+            return self._pipeline_command(
+                video_path, output_path, audio_path, subtitle_path, target_duration, use_nvenc
+            )
+
+        try:
+            if subtitle_path:
+                self._run_encode(self._encode_commands(build_command))
+            else:
+                self._run_ffmpeg(build_command(False))
+            logger.debug("Processed video created: %s", output_path)
+            return output_path
+        except subprocess.CalledProcessError as e:
+            logger.error("Error processing video: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to process video: {str(e)}")
+
+    async def process_pipeline_async(
+        self,
+        video_path: str,
+        output_path: str,
+        audio_path: Optional[str] = None,
+        subtitle_path: Optional[str] = None,
+        target_duration: Optional[float] = None,
+    ) -> str:
+        """Async version of process_pipeline."""
+        self._ensure_dir(output_path)
+
+        def build_command(use_nvenc: bool) -> List[str]:
+            return self._pipeline_command(
+                video_path, output_path, audio_path, subtitle_path, target_duration, use_nvenc
+            )
+
+        try:
+            if subtitle_path:
+                await self._run_encode_async(self._encode_commands(build_command))
+            else:
+                await self._run_ffmpeg_async(build_command(False))
+            logger.debug("Processed video created: %s", output_path)
+            return output_path
+        except subprocess.CalledProcessError as e:
+            logger.error("Error processing video: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to process video: {str(e)}")
+
+    def _pipeline_command(
+        self,
+        video_path: str,
+        output_path: str,
+        audio_path: Optional[str],
+        subtitle_path: Optional[str],
+        target_duration: Optional[float],
+        use_nvenc: bool,
+    ) -> List[str]:
+        """Build the single-pass loop/dub/subtitle command used by process_pipeline."""
+        cmd = ["ffmpeg"]
+        if target_duration is not None:
+            cmd += ["-stream_loop", "-1"]
+        if subtitle_path:
+            cmd += self._input_hwaccel_args()
+        cmd += ["-i", video_path]
+        if audio_path:
+            cmd += ["-i", audio_path]
+        if target_duration is not None:
+            cmd += ["-t", str(target_duration)]
+
+        cmd += ["-map", "0:v", "-map", "1:a" if audio_path else "0:a?"]
+        if subtitle_path:
+            cmd += ["-vf", f"ass={subtitle_path}", *self._video_encoder_args(use_nvenc)]
+        else:
+            cmd += ["-c:v", "copy"]
+        cmd += ["-c:a", "aac"] if audio_path else ["-c:a", "copy"]
+        if audio_path:
+            cmd.append("-shortest")
+        cmd += [output_path, "-y"]
+        return cmd
+
+    def _burn_command(self, video_path: str, subtitle_path: str, output_path: str, use_nvenc: bool) -> List[str]:
+        """Build the command that burns subtitles, with NVENC or libx264."""
+        if use_nvenc:
+            return self._nvenc_burn_command(video_path, subtitle_path, output_path)
+        return [
             "ffmpeg",
+            *self._input_hwaccel_args(),
             "-i",
             video_path,
             "-vf",
             f"ass={subtitle_path}",
             "-c:a",
             "copy",
-            "-c:v",
-            "libx264",
-            "-crf",
-            "18",  # Quality setting (lower is better, 18-28 is good range)
-            "-preset",
-            "medium",  # Encoding speed/compression tradeoff
+            *self._video_encoder_args(False),
             output_path,
             "-y",  # Overwrite output file if it exists
         ]
 
+    def burn_subtitles(self, video_path: str, subtitle_path: str, output_path: str, gpu_overlay: bool = False):
+        """
+        Burn subtitles into video using ffmpeg.
+
+        Args:
+            video_path: Path to the input video
+            subtitle_path: Path to the .ass subtitle file
+            output_path: Path for the output video with burned subtitles
+            gpu_overlay: With NVENC available, render the subtitles to a transparent
+                         overlay first and composite it with overlay_cuda, so frames
+                         never leave GPU memory (worth it for long or high-res videos)
+        """
+        logger.debug("Burning subtitles into video: %s", video_path)
+        logger.debug("Using subtitle file: %s", subtitle_path)
+
+        # Ensure the output directory exists
+        self._ensure_dir(output_path)
+
+        if gpu_overlay and self._nvenc_available:
+            try:
+                logger.debug("Running ffmpeg with overlay_cuda to burn subtitles")
+                self._burn_with_overlay(video_path, subtitle_path, output_path)
+                logger.debug("Successfully created video with burned subtitles: %s", output_path)
+                return True
+            except (subprocess.CalledProcessError, RuntimeError) as e:
+                # e.g. an ffmpeg build without overlay_cuda
+                logger.warning("GPU overlay failed, falling back to the ass filter: %s", e)
+
         try:
-            # Run ffmpeg command
             logger.debug("Running ffmpeg to burn subtitles")
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self._run_encode(self._encode_commands(
+                lambda use_nvenc: self._burn_command(video_path, subtitle_path, output_path, use_nvenc)
+            ))
 
-            logger.debug(f"Successfully created video with burned subtitles: {output_path}")
+            logger.debug("Successfully created video with burned subtitles: %s", output_path)
             return True
 
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error burning subtitles: {e.stderr.decode()}")
+            logger.error("Error burning subtitles: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to burn subtitles into video: {str(e)}")
+
+    def _batch_burn_command(self, jobs: List[Tuple[str, str, str]], use_nvenc: bool) -> List[str]:
+        """Build one ffmpeg command that burns subtitles for every (video, subtitles, output) job."""
+        cmd = ["ffmpeg"]
+        for video_path, _, _ in jobs:
+            if use_nvenc:
+                cmd += ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+            else:
+                cmd += self._input_hwaccel_args()
+            cmd += ["-i", video_path]
+
+        if use_nvenc:
+            filters = [
+                f"[{i}:v]hwdownload,format=nv12,ass={subtitle_path},hwupload_cuda[v{i}]"
+                for i, (_, subtitle_path, _) in enumerate(jobs)
+            ]
+        else:
+            filters = [f"[{i}:v]ass={subtitle_path}[v{i}]" for i, (_, subtitle_path, _) in enumerate(jobs)]
+        cmd += ["-filter_complex", ";".join(filters)]
+
+        # Output options apply to the output file that follows them
+        for i, (_, _, output_path) in enumerate(jobs):
+            cmd += [
+                "-map",
+                f"[v{i}]",
+                "-map",
+                f"{i}:a?",
+                "-c:a",
+                "copy",
+                *self._video_encoder_args(use_nvenc),
+                output_path,
+            ]
+        cmd.append("-y")
+        return cmd
+
+    def burn_subtitles_batch(self, jobs: List[Tuple[str, str, str]]):
+        """
+        Burn subtitles into several videos with a single ffmpeg process.
+
+        Saves the per-process startup (and CUDA context setup with NVENC) that
+        separate burn_subtitles calls would each pay.
+
+        Args:
+            jobs: List of (video_path, subtitle_path, output_path) tuples
+        """
+        if not jobs:
+            return True
+        logger.debug("Burning subtitles into %s videos in one ffmpeg pass", len(jobs))
+
+        for _, _, output_path in jobs:
+            self._ensure_dir(output_path)
+
+        try:
+            self._run_encode(self._encode_commands(lambda use_nvenc: self._batch_burn_command(jobs, use_nvenc)))
+            logger.debug("Successfully created %s videos with burned subtitles", len(jobs))
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error("Error burning subtitles: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to burn subtitles into videos: {str(e)}")
+
+    async def burn_subtitles_batch_async(self, jobs: List[Tuple[str, str, str]]):
+        """Async version of burn_subtitles_batch; the batch takes one ffmpeg slot."""
+        if not jobs:
+            return True
+
+        for _, _, output_path in jobs:
+            self._ensure_dir(output_path)
+
+        try:
+            await self._run_encode_async(
+                self._encode_commands(lambda use_nvenc: self._batch_burn_command(jobs, use_nvenc))
+            )
+            logger.debug("Successfully created %s videos with burned subtitles", len(jobs))
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error("Error burning subtitles: %s", e.stderr.decode())
+            raise RuntimeError(f"Failed to burn subtitles into videos: {str(e)}")
+
+    async def burn_subtitles_async(self, video_path: str, subtitle_path: str, output_path: str):
+        """Async version of burn_subtitles."""
+        self._ensure_dir(output_path)
+
+        try:
+            await self._run_encode_async(self._encode_commands(
+                lambda use_nvenc: self._burn_command(video_path, subtitle_path, output_path, use_nvenc)
+            ))
+            logger.debug("Successfully created video with burned subtitles: %s", output_path)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error("Error burning subtitles: %s", e.stderr.decode())
             raise RuntimeError(f"Failed to burn subtitles into video: {str(e)}")
@@ -4,92 +4,552 @@ whisper_align.py - Aligns a transcript with audio timestamps using Whisper
 
 import logging
 import os
+import re
 import subprocess
-import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Iterator, List, Literal, NamedTuple, Optional, Sequence
 
-import whisper
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Sample rate Whisper models expect
+WHISPER_SAMPLE_RATE = 16000
+
+# Silence shorter than this stays inside a speech region when VAD filtering
+VAD_MIN_SILENCE_MS = 500
+
+# Window length when streaming audio through iter_aligned_segments
+STREAM_WINDOW_SECONDS = 30
+
+# Models used for each quality setting other than "balanced", per backend;
+# transcripts are English, so the English-only variants are used
+QUALITY_MODELS = {
+    "fast": {"faster-whisper": "distil-small.en", "openai-whisper": "tiny.en"},
+    "best": {"faster-whisper": "large-v3", "openai-whisper": "large-v3"},
+}
+
+# Where converted model weights are kept between runs (None: the library default)
+WHISPER_CACHE_DIR = os.environ.get("WHISPER_CACHE_DIR")
+
+# Long audio is cut into windows transcribed concurrently by this many
+# faster-whisper workers; windows overlap so words at the cuts aren't lost
+TRANSCRIBE_WORKERS = 4
+PARALLEL_CHUNK_SECONDS = 30
+PARALLEL_OVERLAP_SECONDS = 1
+
+# Try to import faster-whisper (CTranslate2 backend, supports INT8 inference)
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# Try to import PyAV for decoding audio in-process
+try:
+    import av
+
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# Try to import torchaudio for CTC forced alignment against a known transcript
+try:
+    import torch
+    import torchaudio
+
+    TORCHAUDIO_AVAILABLE = hasattr(torchaudio.functional, "forced_align")
+except ImportError:
+    TORCHAUDIO_AVAILABLE = False
+
+# Try to import openai-whisper as the fallback backend
+try:
+    import whisper
+
+    OPENAI_WHISPER_AVAILABLE = True
+except ImportError:
+    OPENAI_WHISPER_AVAILABLE = False
+
+
+# Loaded models are shared process-wide; the lock keeps two aligners from
+# loading the same weights at once
+_model_lock = threading.Lock()
+
+
+def _detect_device() -> str:
+    """Return "cuda" if the active Whisper backend can use a GPU, otherwise "cpu"."""
+    if FASTER_WHISPER_AVAILABLE:
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+# faster-whisper compute types in order of preference: INT8 weights with
+# 16-bit activations where the hardware has the kernels (e.g. AVX512-BF16)
+_COMPUTE_TYPE_PREFERENCE = {
+    "cuda": ("int8_float16", "int8_bfloat16", "float16"),
+    "cpu": ("int8_bfloat16", "int8"),
+}
+
+
+def _compute_type(device: str) -> str:
+    """Return the fastest CTranslate2 compute type the device supports."""
+    supported = ctranslate2.get_supported_compute_types(device)
+    for compute_type in _COMPUTE_TYPE_PREFERENCE[device]:
+        if compute_type in supported:
+            return compute_type
+    return "default"
+
+
+@lru_cache(maxsize=4)
+def _get_model(
+    model_name: str,
+    device: str,
+    quantize: bool,
+    num_threads: Optional[int] = None,
+    num_workers: int = 1,
+):
+    """
+    Load a Whisper model, once per process for each set of arguments.
+
+    Args:
+        model_name: Whisper model size (tiny, base, small, medium, large)
+        device: "cuda" or "cpu"
+        quantize: Apply dynamic INT8 quantization when running openai-whisper on CPU
+        num_threads: CPU compute threads; defaults to OMP_NUM_THREADS, else all cores
+        num_workers: faster-whisper workers able to transcribe concurrently; the
+                     CPU threads are split between them
+
+    Returns:
+        The loaded faster-whisper or openai-whisper model
+    """
+    # faster-whisper would otherwise use only 4 threads
+    num_threads = num_threads or int(os.environ.get("OMP_NUM_THREADS") or 0) or os.cpu_count() or 1
+
+    if FASTER_WHISPER_AVAILABLE:
+        compute_type = _compute_type(device)
+        logger.info("Loading faster-whisper model: %s (%s, %s)", model_name, device, compute_type)
+        # Split the threads between workers so concurrent windows don't oversubscribe
+        model_kwargs = dict(
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=max(1, num_threads // num_workers),
+            num_workers=num_workers,
+            download_root=WHISPER_CACHE_DIR,
+        )
+        try:
+            # Reuse the already-converted CTranslate2 model without asking the hub
+            return WhisperModel(model_name, local_files_only=True, **model_kwargs)
+        except Exception:
+            logger.info("No cached CTranslate2 model for %s, downloading", model_name)
+            return WhisperModel(model_name, **model_kwargs)
+
+    import torch
+
+    if device == "cpu":
+        torch.set_num_threads(num_threads)
+
+    logger.info("Loading Whisper model: %s (%s)", model_name, device)
+    model = _load_openai_whisper(model_name, device)
+    if quantize and device == "cpu":
+        logger.info("Applying dynamic INT8 quantization to Linear layers")
+        model = torch.quantization.quantize_dynamic(
+            _with_plain_linears(model), {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def _with_plain_linears(model):
+    """
+    Swap whisper's dtype-casting Linear subclass for plain nn.Linear in one model.
+
+    quantize_dynamic only converts modules whose type is exactly nn.Linear.
+    The replacements share the original parameters, and only this instance
+    changes; other models loaded in the process keep whisper's Linear.
+
+    Args:
+        model: Loaded openai-whisper model
+
+    Returns:
+        The same model, modified in place
+    """
+    import torch
+
+    swaps = [
+        (parent, name, child)
+        for parent in model.modules()
+        for name, child in parent.named_children()
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear
+    ]
+    for parent, name, child in swaps:
+        plain = torch.nn.Linear(
+            child.in_features, child.out_features, bias=child.bias is not None, device="meta"
+        )
+        plain.weight = child.weight
+        plain.bias = child.bias
+        setattr(parent, name, plain)
+    return model
+
+
+def _load_openai_whisper(model_name: str, device: str):
+    """
+    Load an openai-whisper model, memory-mapping its checkpoint when possible.
+
+    With mmap the checkpoint is paged in as its tensors are copied into the
+    fp32 model, instead of being read into memory as a whole first, which
+    lowers peak memory while loading. Falls back to whisper.load_model on
+    older PyTorch versions, legacy checkpoints, or custom model paths.
+
+    Args:
+        model_name: Whisper model size (tiny, base, small, medium, large)
+        device: "cuda" or "cpu"
+
+    Returns:
+        The loaded openai-whisper model
+    """
+    import torch
+
+    if model_name not in whisper._MODELS:
+        return whisper.load_model(model_name, device=device, download_root=WHISPER_CACHE_DIR)
+
+    download_root = WHISPER_CACHE_DIR or os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper"
+    )
+    checkpoint_file = whisper._download(whisper._MODELS[model_name], download_root, False)
+    try:
+        checkpoint = torch.load(checkpoint_file, map_location="cpu", mmap=True)
+        model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"]))
+        # Copy into the fp32 parameters; assigning would keep the checkpoint's fp16
+        # tensors, which whisper's LayerNorm and fp32 decoding don't expect
+        model.load_state_dict(checkpoint["model_state_dict"])
+    except (TypeError, RuntimeError) as e:
+        logger.debug("Can't memory-map %s, loading it normally: %s", checkpoint_file, e)
+        return whisper.load_model(model_name, device=device, download_root=WHISPER_CACHE_DIR)
+
+    model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_name])
+    return model.to(device)
+
+
+@lru_cache(maxsize=2)
+def _get_forced_aligner(device: str):
+    """
+    Load the MMS forced-alignment model with its tokenizer and aligner.
+
+    Args:
+        device: "cuda" or "cpu"
+
+    Returns:
+        (model, tokenizer, aligner) from torchaudio.pipelines.MMS_FA
+    """
+    bundle = torchaudio.pipelines.MMS_FA
+    logger.info("Loading MMS forced-alignment model (%s)", device)
+    model = bundle.get_model(with_star=False).to(device)
+    return model, bundle.get_tokenizer(), bundle.get_aligner()
+
+
+@lru_cache(maxsize=1)
+def _silero_vad():
+    """Load the Silero VAD model and its get_speech_timestamps helper from torch hub."""
+    import torch
+
+    model, utils = torch.hub.load("snakers4/silero-vad", "silero_vad", trust_repo=True)
+    return model, utils[0]
+
+
+def _speech_clip_timestamps(audio: np.ndarray) -> List[float]:
+    """
+    Find speech regions with Silero VAD, for openai-whisper's clip_timestamps.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+
+    Returns:
+        Flat [start, end, start, end, ...] list in seconds; empty if VAD is unavailable
+    """
+    try:
+        import torch
+
+        model, get_speech_timestamps = _silero_vad()
+        regions = get_speech_timestamps(
+            torch.from_numpy(audio),
+            model,
+            sampling_rate=WHISPER_SAMPLE_RATE,
+            min_silence_duration_ms=VAD_MIN_SILENCE_MS,
+        )
+    except Exception as e:
+        logger.warning("VAD unavailable, transcribing the full audio: %s", e)
+        return []
+
+    logger.info("VAD kept %s speech regions", len(regions))
+    return [
+        t / WHISPER_SAMPLE_RATE for region in regions for t in (region["start"], region["end"])
+    ]
+
+
+def _pcm_command(video_path: str) -> List[str]:
+    """Build an ffmpeg command that writes a video's audio to stdout as 16 kHz mono s16le."""
+    return [
+        "ffmpeg",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-i",
+        video_path,
+        "-vn",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(WHISPER_SAMPLE_RATE),
+        "-",
+    ]
+
+
+def _pcm_to_float(data: bytes) -> np.ndarray:
+    """Convert s16le PCM bytes to float32 samples in [-1, 1)."""
+    audio = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+    # Scale in place rather than allocating a second full-length array
+    audio *= 1 / 32768.0
+    return audio
+
 
 @dataclass
 class Segment:
     """Represents a segment of aligned transcript with timing information."""
 
+    # Declared by hand (dataclass(slots=True) needs Python 3.10); no per-instance __dict__
+    __slots__ = ("start", "end", "text")
+
     start: float  # Start time in seconds
     end: float  # End time in seconds
     text: str  # Text content
 
 
+class Segments(NamedTuple):
+    """Aligned segments stored column-wise: timings as arrays, texts as a list."""
+
+    start: np.ndarray  # Start times in seconds
+    end: np.ndarray  # End times in seconds
+    text: List[str]  # Text content
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "Segments":
+        """Build from (start, end, text) rows."""
+        count = len(rows)
+        return cls(
+            start=np.fromiter((row[0] for row in rows), dtype=np.float64, count=count),
+            end=np.fromiter((row[1] for row in rows), dtype=np.float64, count=count),
+            text=[row[2] for row in rows],
+        )
+
+    def iter_segments(self) -> Iterator[Segment]:
+        """Yield the rows as Segment objects."""
+        for start, end, text in zip(self.start.tolist(), self.end.tolist(), self.text):
+            yield Segment(start=start, end=end, text=text)
+
+
 class WhisperAligner:
-    """Aligns a transcript with audio using OpenAI's Whisper model."""
+    """Aligns a transcript with audio using Whisper (faster-whisper or OpenAI's implementation)."""
 
-    def __init__(self, model_name: str = "base"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        quantize: bool = True,
+        vad_filter: bool = True,
+        num_threads: Optional[int] = None,
+        quality: Literal["fast", "balanced", "best"] = "balanced",
+    ):
         """
         Initialize the WhisperAligner.
 
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
+            quantize: Apply dynamic INT8 quantization when running openai-whisper on CPU
+            vad_filter: Skip silent stretches with Silero VAD before decoding
+            num_threads: CPU compute threads for the model (default: all cores)
+            quality: "fast" uses a distilled/tiny model (plenty for timing alone),
+                     "best" uses large-v3, "balanced" uses model_name
         """
+        if quality != "balanced":
+            backend = "faster-whisper" if FASTER_WHISPER_AVAILABLE else "openai-whisper"
+            model_name = QUALITY_MODELS[quality][backend]
         self.model_name = model_name
+        self.quantize = quantize
+        self.vad_filter = vad_filter
+        self.num_threads = num_threads
         self.model = None
-        logger.info(f"Initializing WhisperAligner with model: {model_name}")
+        self.device = None
+        logger.info("Initializing WhisperAligner with model: %s", model_name)
 
     def _load_model(self):
-        """Load the Whisper model if not already loaded."""
-        if self.model is None:
-            logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
-            logger.info("Model loaded successfully")
+        """Load the Whisper model if not already loaded, preferring faster-whisper."""
+        if self.model is not None:
+            return
+
+        if not (FASTER_WHISPER_AVAILABLE or OPENAI_WHISPER_AVAILABLE):
+            raise RuntimeError(
+                "No Whisper backend installed. Install faster-whisper or openai-whisper."
+            )
+
+        self.device = _detect_device()
+        # One faster-whisper instance serves both whole clips and concurrent windows
+        num_workers = TRANSCRIBE_WORKERS if FASTER_WHISPER_AVAILABLE else 1
+        with _model_lock:
+            self.model = _get_model(self.model_name, self.device, self.quantize, self.num_threads, num_workers)
+        logger.info("Model loaded successfully")
+
+    def preload(self):
+        """Load the Whisper model ahead of time, e.g. from a background thread."""
+        self._load_model()
 
-    def _extract_audio(self, video_path: str) -> str:
+    def _extract_audio(self, video_path: str) -> np.ndarray:
         """
         Extract audio from a video file using ffmpeg.
 
+        ffmpeg resamples to Whisper's format and streams raw PCM over a pipe,
+        so no temporary file is written.
+
         Args:
             video_path: Path to the input video file
 
         Returns:
-            Path to the extracted audio file
-        """
-        logger.info(f"Extracting audio from video: {video_path}")
-
-        # Create a temporary file for the audio
-        audio_path = tempfile.mktemp(suffix=".wav")
-
-        # Run ffmpeg to extract audio
-        cmd = [
-            "ffmpeg",
-            "-i",
-            video_path,
-            "-q:a",
-            "0",
-            "-map",
-            "a",
-            "-vn",
-            audio_path,
-            "-y",
-        ]
+            16 kHz mono float32 samples
+        """
+        logger.info("Extracting audio from video: %s", video_path)
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True)
-            logger.info(f"Audio extracted to: {audio_path}")
-            return audio_path
+            result = subprocess.run(_pcm_command(video_path), check=True, capture_output=True)
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error extracting audio: {e.stderr.decode()}")
+            logger.error("Error extracting audio: %s", e.stderr.decode())
             raise RuntimeError(f"Failed to extract audio from {video_path}")
 
-    def _whisper_transcribe(self, audio_path: str) -> Dict[str, Any]:
+        audio = _pcm_to_float(result.stdout)
+        logger.info("Extracted %.1fs of audio", len(audio) / WHISPER_SAMPLE_RATE)
+        return audio
+
+    def _decode_audio(self, video_path: str) -> np.ndarray:
         """
-        Transcribe audio using Whisper and get word-level timestamps.
+        Decode a video's audio track in memory with PyAV.
 
         Args:
-            audio_path: Path to the audio file
+            video_path: Path to the input video file
 
         Returns:
-            Whisper transcription result
+            16 kHz mono float32 samples, the format Whisper consumes directly
+        """
+        logger.info("Decoding audio from video: %s", video_path)
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=WHISPER_SAMPLE_RATE)
+        chunks = []
+        with av.open(video_path) as container:
+            for frame in container.decode(audio=0):
+                chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(frame))
+        # Drain samples still buffered in the resampler
+        chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(None))
+
+        audio = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+        logger.info("Decoded %.1fs of audio", len(audio) / WHISPER_SAMPLE_RATE)
+        return audio
+
+    def _forced_align(self, audio: np.ndarray, transcript_text: str) -> Optional[Segments]:
+        """
+        Time each transcript word with CTC forced alignment (torchaudio MMS_FA).
+
+        One encoder pass plus a Viterbi search replaces Whisper's autoregressive
+        decoding. Words the model's alphabet can't spell (numbers, symbols) are
+        attached to a neighbouring word.
+
+        Args:
+            audio: 16 kHz mono float32 samples
+            transcript_text: The spoken text
+
+        Returns:
+            Word-level segments, or None if the transcript has no alignable words
+        """
+        words = []
+        tokens = []
+        leading = []
+        for word in transcript_text.split():
+            normalized = re.sub(r"[^a-z']", "", word.lower())
+            if normalized:
+                words.append(" ".join(leading + [word]) if leading else word)
+                tokens.append(normalized)
+                leading = []
+            elif words:
+                words[-1] = f"{words[-1]} {word}"
+            else:
+                leading.append(word)
+        if not tokens:
+            return None
+
+        logger.info("Force-aligning %s transcript words", len(tokens))
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model, tokenizer, aligner = _get_forced_aligner(device)
+        with torch.inference_mode():
+            waveform = torch.from_numpy(audio).unsqueeze(0).to(device)
+            emission, _ = model(waveform)
+        token_spans = aligner(emission[0].cpu(), tokenizer(tokens))
+
+        # Seconds per emission frame
+        frame_seconds = waveform.size(1) / emission.size(1) / WHISPER_SAMPLE_RATE
+        return Segments.from_rows([
+            (spans[0].start * frame_seconds, spans[-1].end * frame_seconds, word)
+            for spans, word in zip(token_spans, words)
+        ])
+
+    def _transcribe_windows(self, audio: np.ndarray, transcribe_kwargs: dict) -> List[tuple]:
+        """
+        Transcribe fixed windows of a long recording concurrently with faster-whisper.
+
+        Each window is padded by PARALLEL_OVERLAP_SECONDS on both sides; a
+        segment is kept by the window that owns its midpoint, so segments in
+        the overlaps aren't duplicated.
+
+        Args:
+            audio: 16 kHz mono float32 samples
+            transcribe_kwargs: Options for WhisperModel.transcribe
+
+        Returns:
+            (start, end, text) rows in time order, relative to the full audio
+        """
+        chunk = PARALLEL_CHUNK_SECONDS * WHISPER_SAMPLE_RATE
+        overlap = PARALLEL_OVERLAP_SECONDS * WHISPER_SAMPLE_RATE
+
+        def transcribe_window(start: int) -> List[tuple]:
+            window_start = max(0, start - overlap)
+            offset = window_start / WHISPER_SAMPLE_RATE
+            owned_from, owned_to = start / WHISPER_SAMPLE_RATE, (start + chunk) / WHISPER_SAMPLE_RATE
+            segments, _ = self.model.transcribe(
+                audio[window_start:start + chunk + overlap], **transcribe_kwargs
+            )
+            rows = []
+            for s in segments:
+                start_s, end_s = s.start + offset, s.end + offset
+                if owned_from <= (start_s + end_s) / 2 < owned_to:
+                    rows.append((start_s, end_s, s.text.strip()))
+            return rows
+
+        starts = range(0, len(audio), chunk)
+        logger.info("Transcribing %s windows with %s workers", len(starts), TRANSCRIBE_WORKERS)
+        with ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS) as executor:
+            return [row for rows in executor.map(transcribe_window, starts) for row in rows]
+
+    def _whisper_transcribe(self, audio: np.ndarray) -> Segments:
+        """
+        Transcribe audio using Whisper and get segment timestamps.
+
+        Args:
+            audio: 16 kHz mono float32 samples
+
+        Returns:
+            Transcribed segments with timing information
         """
         logger.info("Transcribing audio with Whisper")
         self._load_model()
@@ -99,14 +559,45 @@ class WhisperAligner:
             "task": "transcribe",
             # "word_timestamps": True,
             "language": "en",
-            "verbose": True,
-            # "fp16": False,  # Added to avoid attribute src issues
+            # verbose=None prints nothing; True echoes every segment to stdout
+            "verbose": True if logger.isEnabledFor(logging.DEBUG) else None,
+            # Half precision runs the GEMMs on tensor cores; CPU has no fp16 kernels
+            "fp16": self.device == "cuda",
+            # Greedy decoding without temperature fallback: timings are what we need,
+            # and not conditioning on earlier text avoids repetition loops
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
         }
 
         # Run transcription
-        result = self.model.transcribe(audio_path, **options)
-        logger.info(f"Transcription complete: {len(result['segments'])} segments")
-        return result
+        if FASTER_WHISPER_AVAILABLE:
+            transcribe_kwargs = dict(
+                task=options["task"],
+                language=options["language"],
+                beam_size=1,
+                best_of=1,
+                temperature=options["temperature"],
+                condition_on_previous_text=options["condition_on_previous_text"],
+                without_timestamps=False,
+                vad_filter=self.vad_filter,
+                vad_parameters={"min_silence_duration_ms": VAD_MIN_SILENCE_MS},
+            )
+            # Anything longer than one window is split so the model's workers all get a share
+            if len(audio) > PARALLEL_CHUNK_SECONDS * WHISPER_SAMPLE_RATE:
+                rows = self._transcribe_windows(audio, transcribe_kwargs)
+            else:
+                # transcribe() yields segments lazily; build ours straight from them
+                segments, _ = self.model.transcribe(audio, **transcribe_kwargs)
+                rows = [(s.start, s.end, s.text.strip()) for s in segments]
+        else:
+            if self.vad_filter:
+                clip_timestamps = _speech_clip_timestamps(audio)
+                if clip_timestamps:
+                    options["clip_timestamps"] = clip_timestamps
+            result = self.model.transcribe(audio, **options)
+            rows = [(s["start"], s["end"], s["text"].strip()) for s in result["segments"]]
+        logger.info("Transcription complete: %s segments", len(rows))
+        return Segments.from_rows(rows)
 
     def align_transcript(self, video_path: str, transcript_path: str) -> List[Segment]:
         """
@@ -119,32 +610,166 @@ class WhisperAligner:
         Returns:
             List of aligned transcript segments with timing information
         """
-        # Extract audio from video
-        audio_path = self._extract_audio(video_path)
+        return list(self.align_transcript_columns(video_path, transcript_path).iter_segments())
 
-        try:
-            # Transcribe audio with Whisper to get timestamps
-            result = self._whisper_transcribe(audio_path)
+    def align_transcript_columns(self, video_path: str, transcript_path: str) -> Segments:
+        """
+        Align transcript with audio, returning column-wise segments.
 
-            # Convert Whisper segments to our segment format
-            segments = []
-            for s in result["segments"]:
-                segment = Segment(
-                    start=s["start"], end=s["end"], text=s["text"].strip()
-                )
-                segments.append(segment)
+        Uses forced alignment of the transcript text when torchaudio is
+        available, and Whisper transcription otherwise.
 
-            logger.info(f"Created {len(segments)} aligned segments")
+        Args:
+            video_path: Path to the input video
+            transcript_path: Path to the transcript
 
-            # Clean up temporary audio file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+        Returns:
+            Aligned segments as start/end arrays and a list of texts
+        """
+        transcript_text = None
+        if transcript_path and TORCHAUDIO_AVAILABLE:
+            with open(transcript_path, "r", encoding="utf-8") as f:
+                transcript_text = f.read()
 
-            return segments
+        # Decode in-process when PyAV is available, otherwise pipe PCM from ffmpeg;
+        # either way the samples go straight to Whisper without a temp file
+        if AV_AVAILABLE:
+            audio = self._decode_audio(video_path)
+        else:
+            audio = self._extract_audio(video_path)
 
+        try:
+            segments = None
+            if transcript_text:
+                # The text is already known, so only its timing is needed
+                try:
+                    segments = self._forced_align(audio, transcript_text)
+                except Exception as e:
+                    logger.warning("Forced alignment failed, falling back to Whisper: %s", e)
+            if segments is None:
+                # Transcribe audio with Whisper to get timestamps
+                segments = self._whisper_transcribe(audio)
         except Exception as e:
-            logger.error(f"Error in alignment process: {str(e)}")
-            # Clean up temporary audio file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+            logger.error("Error in alignment process: %s", e)
             raise
+
+        logger.info("Created %s aligned segments", len(segments.text))
+        return segments
+
+    def iter_aligned_segments(self, video_path: str) -> Iterator[Segment]:
+        """
+        Transcribe a video window by window, yielding segments as they are ready.
+
+        Audio is read from ffmpeg in STREAM_WINDOW_SECONDS windows, so memory
+        stays bounded however long the video is. Windows overlap by
+        PARALLEL_OVERLAP_SECONDS, and each segment is emitted only by the window
+        that owns its midpoint.
+
+        Args:
+            video_path: Path to the input video
+
+        Yields:
+            Aligned segments in time order
+        """
+        window = STREAM_WINDOW_SECONDS * WHISPER_SAMPLE_RATE
+        overlap = PARALLEL_OVERLAP_SECONDS * WHISPER_SAMPLE_RATE
+
+        logger.info("Streaming audio from video: %s", video_path)
+        proc = subprocess.Popen(
+            _pcm_command(video_path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        buffer = np.zeros(0, dtype=np.float32)
+        buffer_start = 0  # Sample index of buffer[0]
+        owned_from = 0  # First sample this window emits segments for
+        try:
+            eof = False
+            while not eof:
+                # Fill up to the end of the owned window plus the lookahead overlap
+                needed = (owned_from + window + overlap - buffer_start - len(buffer)) * 2
+                data = proc.stdout.read(needed)
+                eof = len(data) < needed
+                buffer = np.concatenate([buffer, _pcm_to_float(data[: len(data) - len(data) % 2])])
+                if buffer_start + len(buffer) <= owned_from:
+                    break
+
+                segments = self._whisper_transcribe(buffer)
+                offset = buffer_start / WHISPER_SAMPLE_RATE
+                owned_start = owned_from / WHISPER_SAMPLE_RATE
+                owned_end = float("inf") if eof else (owned_from + window) / WHISPER_SAMPLE_RATE
+                for start, end, text in zip(segments.start.tolist(), segments.end.tolist(), segments.text):
+                    start, end = start + offset, end + offset
+                    if owned_start <= (start + end) / 2 < owned_end:
+                        yield Segment(start=start, end=end, text=text)
+
+                # Keep only the overlap the next window looks back into
+                owned_from += window
+                buffer = buffer[owned_from - overlap - buffer_start:]
+                buffer_start = owned_from - overlap
+            returncode = proc.wait()
+        finally:
+            # Stop ffmpeg if the caller abandoned the generator early
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+        if returncode:
+            raise RuntimeError(f"Failed to extract audio from {video_path}")
+
+    @classmethod
+    def align_many(
+        cls,
+        video_paths: Sequence[str],
+        transcript_paths: Sequence[str],
+        model_name: str = "base",
+        threads_per_model: int = 4,
+    ) -> List[List[Segment]]:
+        """
+        Align several videos in parallel, one Whisper model per worker process.
+
+        A single model doesn't keep every core busy, so the CPUs are split
+        between workers of threads_per_model threads each.
+
+        Args:
+            video_paths: Paths to the input videos
+            transcript_paths: Transcript for each video
+            model_name: Whisper model size (tiny, base, small, medium, large)
+            threads_per_model: Compute threads given to each worker's model
+
+        Returns:
+            Aligned segments for each video, in input order
+        """
+        workers = max(1, min(len(video_paths), (os.cpu_count() or 1) // threads_per_model))
+        logger.info("Aligning %s videos with %s workers", len(video_paths), workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_worker_init,
+            initargs=(model_name, threads_per_model),
+        ) as executor:
+            return list(executor.map(_worker_align, video_paths, transcript_paths))
+
+
+# Aligner owned by a worker process of WhisperAligner.align_many
+_worker_aligner = None
+
+
+def _worker_init(model_name: str, num_threads: int):
+    """Give a worker process its own model, limited to num_threads compute threads."""
+    global _worker_aligner
+
+    # torch is already imported and read OMP_NUM_THREADS, so set its pool directly;
+    # it also runs forced alignment and VAD in the worker
+    try:
+        import torch
+
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    _worker_aligner = WhisperAligner(model_name, num_threads=num_threads)
+    _worker_aligner.preload()
+
+
+def _worker_align(video_path: str, transcript_path: str) -> List[Segment]:
+    """Align one video with the worker's model."""
+    return _worker_aligner.align_transcript(video_path, transcript_path)
@@ -7,7 +7,8 @@ import argparse
 import logging
 import time
 import sys
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
 import json
 
 try:
@@ -42,19 +43,35 @@ because she changed her mind.
 """
 
 
-def ensure_model_available(model_name: str) -> bool:
+def list_local_models() -> Set[str]:
+    """
+    Fetch the names of the models available on the Ollama server.
+
+    Returns:
+        Set of model names (empty if the server couldn't be queried)
+    """
+    try:
+        return {model.get("name") for model in ollama.list().get("models", [])}
+    except Exception as e:
+        logger.error(f"Error listing models: {e}")
+        return set()
+
+
+def ensure_model_available(model_name: str, available_models: Optional[Set[str]] = None) -> bool:
     """
     Ensure model is available, pulling it if needed.
 
     Args:
         model_name: Name of the model to check
+        available_models: Models already known to be available; fetched from
+                          the server when not given
 
     Returns:
         True if model is available, False if it couldn't be pulled
     """
     try:
-        models = ollama.list()
-        available_models = [model.get("name") for model in models.get("models", [])]
+        if available_models is None:
+            available_models = list_local_models()
 
         if model_name not in available_models:
             logger.info(
@@ -101,8 +118,11 @@ def benchmark_model(
 
         gen_time = end_time - start_time
         output = response.get("response", "")
-        token_count = len(output.split())
-        tokens_per_second = token_count / gen_time if gen_time > 0 else 0
+
+        # Use the server's own token count and decode time (in nanoseconds)
+        token_count = response.get("eval_count", 0)
+        eval_ns = response.get("eval_duration", 0)
+        tokens_per_second = token_count * 1e9 / eval_ns if eval_ns else 0
 
         result.update(
             {
@@ -120,8 +140,25 @@ def benchmark_model(
     return result
 
 
+def _run_benchmark(model_name: str, prompt: str, max_tokens: int) -> Dict[str, Any]:
+    """Benchmark one model and log its outcome."""
+    logger.info(f"Benchmarking model: {model_name}")
+
+    result = benchmark_model(model_name, prompt, max_tokens)
+
+    if result["success"]:
+        logger.info(
+            f"{model_name}: Generation time: {result['generation_time']:.2f}s, "
+            f"Tokens/sec: {result['tokens_per_second']:.2f}"
+        )
+    else:
+        logger.error(f"Failed to benchmark model {model_name}: {result['error']}")
+
+    return result
+
+
 def compare_models(
-    models: List[str], prompt: str, max_tokens: int = 200
+    models: List[str], prompt: str, max_tokens: int = 200, parallel: int = 1
 ) -> List[Dict[str, Any]]:
     """
     Compare multiple models on the same prompt.
@@ -130,29 +167,26 @@ def compare_models(
         models: List of model names to compare
         prompt: Prompt to use for generation
         max_tokens: Maximum tokens to generate
+        parallel: Number of models to benchmark concurrently
 
     Returns:
         List of benchmark results for each model
     """
-    results = []
+    # Pull missing models up front; this touches the shared registry, so keep it serial
+    local_models = list_local_models()
+    available = {model_name: ensure_model_available(model_name, local_models) for model_name in models}
+    runnable = [model_name for model_name in models if available[model_name]]
 
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        futures = {
+            model_name: executor.submit(_run_benchmark, model_name, prompt, max_tokens)
+            for model_name in runnable
+        }
+
+    results = []
     for model_name in models:
-        if ensure_model_available(model_name):
-            logger.info(f"Benchmarking model: {model_name}")
-
-            result = benchmark_model(model_name, prompt, max_tokens)
-            results.append(result)
-
-            if result["success"]:
-                logger.info(
-                    f"Generation time: {result['generation_time']:.2f}s, "
-                    f"Tokens/sec: {result['tokens_per_second']:.2f}"
-                )
-            else:
-                logger.error(f"Failed to benchmark model: {result['error']}")
-
-            # Give the system a moment to recover
-            time.sleep(1)
+        if model_name in futures:
+            results.append(futures[model_name].result())
         else:
             results.append(
                 {
@@ -212,6 +246,9 @@ def main():
         "--max-tokens", type=int, default=200, help="Maximum tokens to generate"
     )
     parser.add_argument("--output-json", type=str, help="Save results to JSON file")
+    parser.add_argument(
+        "--parallel", type=int, default=1, help="Number of models to benchmark concurrently"
+    )
 
     args = parser.parse_args()
 
@@ -224,24 +261,15 @@ def main():
 
     logger.info(f"Comparing {len(models)} models: {', '.join(models)}")
 
-    results = compare_models(models, prompt, args.max_tokens)
+    results = compare_models(models, prompt, args.max_tokens, args.parallel)
     display_comparison_table(results)
 
     if args.output_json:
-        # Clean results for JSON serialization (remove actual output text)
-        clean_results = []
-        for r in results:
-            r_copy = r.copy()
-            if r_copy.get("output"):
-                r_copy["output"] = (
-                    r_copy["output"][:100] + "..."
-                    if len(r_copy["output"]) > 100
-                    else r_copy["output"]
-                )
-            clean_results.append(r_copy)
-
+        # Leave the generated text out of the saved results; only the metrics matter
         with open(args.output_json, "w") as f:
-            json.dump(clean_results, f, indent=2)
+            json.dump(
+                [{k: v for k, v in r.items() if k != "output"} for r in results], f, indent=2
+            )
         logger.info(f"Results saved to {args.output_json}")
 
     # Recommend the best model based on speed and availability
@@ -1,20 +1,75 @@
 """
 TTS Comparison - Comparing Google TTS and AWS Polly
 """
+import html
 import os
 import sys
 import logging
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import from main package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from tts.goolge_translate import TextToSpeechGenerator
-from tts.aws_poly import AwsPollyTTS
+from tts.aws_poly import TextToSpeechGenerator as AwsPollyTTS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>TTS Comparison: Google TTS vs AWS Polly</title>
+<style>
+body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
+.phrase { margin-bottom: 40px; border: 1px solid #ddd; padding: 20px; border-radius: 5px; }
+.players { display: flex; flex-wrap: wrap; }
+.player { margin: 10px; flex: 1 0 200px; }
+h1, h2 { color: #333; }
+.text { font-size: 18px; margin-bottom: 20px; padding: 10px; background: #f5f5f5; border-radius: 5px; }
+audio { width: 100%; }
+</style>
+</head>
+<body>
+<h1>Text-to-Speech Comparison</h1>
+<p>This page compares the default Google TTS service with AWS Polly voices.</p>
+"""
+
+_PHRASE_TEMPLATE = Template("""<div class="phrase">
+<h2>Phrase $number</h2>
+<div class="text">$phrase</div>
+<div class="players">
+<div class="player">
+<h3>Google TTS</h3>
+<audio controls src="phrase${number}_google.mp3"></audio>
+</div>
+<div class="player">
+<h3>AWS Polly (Joanna)</h3>
+<audio controls src="phrase${number}_aws_joanna.mp3"></audio>
+</div>
+<div class="player">
+<h3>AWS Polly (Matthew)</h3>
+<audio controls src="phrase${number}_aws_matthew.mp3"></audio>
+</div>
+</div>
+</div>
+""")
+
+_HTML_FOOTER = """</body>
+</html>
+"""
+
+
+def _html_parts(phrases):
+    """Yield the comparison page piece by piece: header, one block per phrase, footer."""
+    yield _HTML_HEADER
+    for i, phrase in enumerate(phrases):
+        yield _PHRASE_TEMPLATE.substitute(number=i + 1, phrase=html.escape(phrase))
+    yield _HTML_FOOTER
+
 
 def main():
     """Compare Google TTS and AWS Polly voices"""
@@ -36,71 +91,28 @@ def main():
     aws_joanna = AwsPollyTTS(voice_id="Joanna", engine="neural")
     aws_matthew = AwsPollyTTS(voice_id="Matthew", engine="neural")
 
-    # Generate speech for each phrase
-    for i, phrase in enumerate(phrases):
-        logger.info(f"Processing phrase {i+1}: {phrase[:30]}...")
-
-        # Generate with Google TTS
-        google_output = os.path.join(output_dir, f"phrase{i+1}_google.mp3")
-        google_tts.generate_speech(text=phrase, output_path=google_output)
+    engines = [
+        ("google", google_tts),
+        ("aws_joanna", aws_joanna),
+        ("aws_matthew", aws_matthew),
+    ]
 
-        # Generate with AWS Polly (Joanna)
-        joanna_output = os.path.join(output_dir, f"phrase{i+1}_aws_joanna.mp3")
-        aws_joanna.generate_speech(text=phrase, output_path=joanna_output)
+    # Every (phrase, engine) pair is an independent network request, so run them concurrently
+    jobs = [
+        (engine, phrase, os.path.join(output_dir, f"phrase{i+1}_{name}.mp3"))
+        for i, phrase in enumerate(phrases)
+        for name, engine in engines
+    ]
+    logger.info(f"Generating {len(jobs)} audio files for {len(phrases)} phrases")
 
-        # Generate with AWS Polly (Matthew)
-        matthew_output = os.path.join(output_dir, f"phrase{i+1}_aws_matthew.mp3")
-        aws_matthew.generate_speech(text=phrase, output_path=matthew_output)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # list() re-raises the first failed request
+        list(executor.map(lambda job: job[0].generate_speech(text=job[1], output_path=job[2]), jobs))
 
     # Create a comparison HTML page to easily listen to the differences
     html_output = os.path.join(output_dir, "comparison.html")
-    with open(html_output, 'w') as f:
-        f.write("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>TTS Comparison: Google TTS vs AWS Polly</title>
-            <style>
-                body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
-                .phrase { margin-bottom: 40px; border: 1px solid #ddd; padding: 20px; border-radius: 5px; }
-                .players { display: flex; flex-wrap: wrap; }
-                .player { margin: 10px; flex: 1 0 200px; }
-                h1, h2 { color: #333; }
-                .text { font-size: 18px; margin-bottom: 20px; padding: 10px; background: #f5f5f5; border-radius: 5px; }
-                audio { width: 100%; }
-            </style>
-        </head>
-        <body>
-            <h1>Text-to-Speech Comparison</h1>
-            <p>This page compares the default Google TTS service with AWS Polly voices.</p>
-        """)
-
-        for i, phrase in enumerate(phrases):
-            f.write(f"""
-            <div class="phrase">
-                <h2>Phrase {i+1}</h2>
-                <div class="text">{phrase}</div>
-                <div class="players">
-                    <div class="player">
-                        <h3>Google TTS</h3>
-                        <audio controls src="phrase{i+1}_google.mp3"></audio>
-                    </div>
-                    <div class="player">
-                        <h3>AWS Polly (Joanna)</h3>
-                        <audio controls src="phrase{i+1}_aws_joanna.mp3"></audio>
-                    </div>
-                    <div class="player">
-                        <h3>AWS Polly (Matthew)</h3>
-                        <audio controls src="phrase{i+1}_aws_matthew.mp3"></audio>
-                    </div>
-                </div>
-            </div>
-            """)
-
-        f.write("""
-        </body>
-        </html>
-        """)
+    with open(html_output, "wb") as f:
+        f.writelines(part.encode("utf-8") for part in _html_parts(phrases))
 
     print(f"\nTTS comparison completed! Audio files saved to {output_dir}")
     print(f"Open {html_output} in a web browser to compare the voices")
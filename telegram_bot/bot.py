@@ -2,20 +2,73 @@
 """
 telegram_bot.py - Module for sending videos and text messages to Telegram chats
 """
+import contextlib
+import json
 import logging
 import os
 import asyncio
 import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
 
 from telegram import Bot
 from telegram.constants import ParseMode
 
+# Try to import aiohttp for direct, streamed multipart uploads
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# aiohttp sessions, one per event loop, and how many senders are using each: each
+# thread's asyncio.run() gets its own, so concurrent senders never close each other's
+_http_sessions = {}
+_http_session_users = {}
+
+
+@contextlib.asynccontextmanager
+async def http_session_scope():
+    """
+    Keep the running event loop's aiohttp session open for the duration of the block.
+
+    The session is created on first entry and closed when the last scope open on
+    the loop exits, so nested and concurrent sends share one connection pool and
+    no session outlives them.
+
+    Yields:
+        aiohttp.ClientSession, or None when aiohttp isn't installed
+    """
+    if not AIOHTTP_AVAILABLE:
+        yield None
+        return
+
+    loop = asyncio.get_running_loop()
+    if loop not in _http_sessions:
+        _http_sessions[loop] = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=120),
+            connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+        )
+        _http_session_users[loop] = 0
+    session = _http_sessions[loop]
+    _http_session_users[loop] += 1
+    try:
+        yield session
+    finally:
+        _http_session_users[loop] -= 1
+        if not _http_session_users[loop]:
+            del _http_sessions[loop], _http_session_users[loop]
+            await session.close()
+
 
 class TelegramBot:
     """Class to handle Telegram bot functionalities"""
@@ -56,10 +109,17 @@ class TelegramBot:
             return False
 
         try:
-            with open(video_path, "rb") as video_file:
+            if AIOHTTP_AVAILABLE:
+                async with http_session_scope() as session:
+                    await self._upload_video(session, video_path, target_chat_id, caption)
+            else:
+                # Read the file in a worker thread so the event loop stays free for other sends
+                loop = asyncio.get_running_loop()
+                video_bytes = await loop.run_in_executor(None, Path(video_path).read_bytes)
                 await self.bot.send_video(
                     chat_id=target_chat_id,
-                    video=video_file,
+                    video=video_bytes,
+                    filename=os.path.basename(video_path),
                     caption=caption,
                     parse_mode=ParseMode.MARKDOWN,
                     read_timeout=60,
@@ -71,6 +131,31 @@ class TelegramBot:
             logger.error(f"Failed to send video: {str(e)}")
             return False
 
+    async def _upload_video(self, session, video_path: str, chat_id: str, caption: str = None):
+        """
+        Upload a video with a direct multipart sendVideo request.
+
+        aiohttp streams the file from disk in chunks (reading in a worker thread),
+        and the event loop's session keeps connections alive between uploads.
+
+        Raises:
+            RuntimeError: If Telegram rejects the request
+        """
+        with open(video_path, "rb") as video_file:
+            form = aiohttp.FormData()
+            form.add_field("chat_id", str(chat_id))
+            if caption:
+                form.add_field("caption", caption)
+                form.add_field("parse_mode", ParseMode.MARKDOWN.value)
+            form.add_field(
+                "video", video_file, filename=os.path.basename(video_path), content_type="video/mp4"
+            )
+            async with session.post(f"{TELEGRAM_API_URL}/bot{self.token}/sendVideo", data=form) as response:
+                result = await response.json()
+
+        if not result.get("ok"):
+            raise RuntimeError(result.get("description", f"HTTP {response.status}"))
+
     def send_video(
         self, video_path: str, chat_id: str = None, caption: str = None
     ) -> bool:
@@ -135,9 +220,152 @@ class TelegramBot:
         return asyncio.run(self.send_text_async(text, chat_id, parse_mode))
 
 
+# Audio bitrate used when re-encoding oversized videos, in kbps
+AUDIO_KBPS = 128
+
+# Portrait (9:16) resolutions for TikTok, Instagram Reels and YouTube Shorts, with the
+# minimum video bitrate (kbps) each one still looks acceptable at
+RESOLUTION_LADDER = [(2500, '1080:1920'), (1500, '720:1280'), (800, '540:960'), (0, '360:640')]
+
+# Fixed encoder arguments shared by every size-reduction command
+_X264_ARGS = ('-c:v', 'libx264', '-preset', 'veryfast')
+_AAC_ARGS = ('-c:a', 'aac', '-b:a', f'{AUDIO_KBPS}k')
+
+
+def _media_probe_command(video_path: str) -> list:
+    """Build the ffprobe command that prints the duration and stream codecs/bitrates as JSON."""
+    return [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration:stream=codec_type,codec_name,bit_rate',
+        '-of', 'json', video_path
+    ]
+
+
+def _first_stream(probe: dict, codec_type: str) -> dict:
+    """Return the first stream of the given type from ffprobe JSON output, or an empty dict."""
+    return next((st for st in probe.get('streams', []) if st.get('codec_type') == codec_type), {})
+
+
+def _stream_kbps(stream: dict) -> float:
+    """Bitrate of a probed stream in kbps, or infinity when ffprobe doesn't report one."""
+    try:
+        return int(stream['bit_rate']) / 1000
+    except (KeyError, ValueError):
+        return float('inf')
+
+
+def _target_video_kbps(max_size_mb: float, duration: float) -> int:
+    """Video bitrate that fits max_size_mb next to the audio track, with an 8% safety margin."""
+    if duration <= 0:
+        return 0
+    return int((max_size_mb * 8192 - AUDIO_KBPS * duration) / duration * 0.92)
+
+
+def _resolution_for_bitrate(video_kbps: int) -> str:
+    """Pick the largest resolution from RESOLUTION_LADDER that the bitrate can sustain."""
+    return next(resolution for min_kbps, resolution in RESOLUTION_LADDER if video_kbps >= min_kbps)
+
+
+def _size_limited_encode_command(video_path: str, output_path: str, video_kbps: int, resolution: str) -> list:
+    """Build the ffmpeg command that re-encodes a video at a fixed target bitrate."""
+    return [
+        'ffmpeg', '-y', '-i', video_path,
+        '-vf', f'scale={resolution}',
+        *_X264_ARGS,
+        '-b:v', f'{video_kbps}k', '-maxrate', f'{int(video_kbps * 1.5)}k', '-bufsize', f'{video_kbps * 2}k',
+        *_AAC_ARGS, output_path
+    ]
+
+
+def _needs_size_reduction(video_path: str, max_size_mb: float) -> bool:
+    """Return True if the video exists and is larger than max_size_mb."""
+    try:
+        st = os.stat(video_path)
+    except FileNotFoundError:
+        logger.error(f"Video file not found: {video_path}")
+        return False
+
+    # Check file size
+    file_size_mb = st.st_size / (1024 * 1024)
+
+    if file_size_mb <= max_size_mb:
+        logger.info(f"Video size is {file_size_mb:.2f}MB, under the {max_size_mb}MB limit")
+        return False
+
+    logger.info(f"Video size is {file_size_mb:.2f}MB, exceeding the {max_size_mb}MB limit. Re-encoding...")
+    return True
+
+
+def _reduced_output_path(video_path: str) -> str:
+    """Path the size-reduced copy of a video is written to."""
+    base_name, ext = os.path.splitext(video_path)
+    return f"{base_name}_reduced{ext}"
+
+
+def _plan_size_reduction(video_path: str, output_path: str, max_size_mb: float, probe: dict):
+    """Return the ffmpeg command that fits the video under max_size_mb, or None if it can't fit."""
+    duration = float(probe['format']['duration'])
+    video_kbps = _target_video_kbps(max_size_mb, duration)
+    if video_kbps <= 0:
+        logger.warning(f"A {duration:.1f}s video cannot fit in {max_size_mb}MB, returning original")
+        return None
+
+    # An H.264 stream already within the budget would only grow if re-encoded; the excess
+    # is in the audio or extra streams, so copy the video and only redo the audio
+    video_stream = _first_stream(probe, 'video')
+    if video_stream.get('codec_name') == 'h264' and _stream_kbps(video_stream) <= video_kbps:
+        audio_stream = _first_stream(probe, 'audio')
+        if audio_stream.get('codec_name') == 'aac' and _stream_kbps(audio_stream) <= AUDIO_KBPS:
+            audio_args = ['-c:a', 'copy']
+        else:
+            audio_args = _AAC_ARGS
+        logger.info("Video stream already fits the bitrate budget, copying it without re-encoding")
+        return [
+            'ffmpeg', '-y', '-i', video_path,
+            '-map', '0:v:0', '-map', '0:a:0?', '-c:v', 'copy', *audio_args, output_path
+        ]
+
+    resolution = _resolution_for_bitrate(video_kbps)
+    logger.info(f"Encoding at {video_kbps}kbps with resolution {resolution}")
+    return _size_limited_encode_command(video_path, output_path, video_kbps, resolution)
+
+
+def _log_reduced_size(output_path: str, max_size_mb: float) -> str:
+    """Log how the re-encoded video turned out and return its path."""
+    new_size_mb = os.stat(output_path).st_size / (1024 * 1024)
+    if new_size_mb > max_size_mb:
+        logger.warning(f"Could not reduce video below size limit ({new_size_mb:.2f}MB), returning it anyway")
+    else:
+        logger.info(f"Successfully reduced video to {new_size_mb:.2f}MB")
+    return output_path
+
+
+async def _run_subprocess_async(cmd: list) -> bytes:
+    """
+    Run a command without blocking the event loop.
+
+    Returns:
+        bytes: The command's stdout
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    out, err = await proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=out, stderr=err)
+    return out
+
+
 def ensure_video_under_size_limit(video_path: str, max_size_mb: float = 50.0) -> str:
     """
-    Checks if a video is under the size limit and reduces resolution if needed.
+    Checks if a video is under the size limit and re-encodes it to fit if needed.
+
+    The video bitrate is derived from the duration so a single encode lands
+    under the limit; the resolution is picked to suit that bitrate. An H.264
+    stream that is already within that bitrate is copied instead of re-encoded.
 
     Args:
         video_path (str): Path to the video file
@@ -146,68 +374,65 @@ def ensure_video_under_size_limit(video_path: str, max_size_mb: float = 50.0) ->
     Returns:
         str: Path to the video file that's under the size limit (could be original or processed)
     """
-    if not os.path.exists(video_path):
-        logger.error(f"Video file not found: {video_path}")
+    if not _needs_size_reduction(video_path, max_size_mb):
         return video_path
 
-    # Check file size
-    file_size_bytes = os.path.getsize(video_path)
-    file_size_mb = file_size_bytes / (1024 * 1024)
+    output_path = _reduced_output_path(video_path)
 
-    if file_size_mb <= max_size_mb:
-        logger.info(f"Video size is {file_size_mb:.2f}MB, under the {max_size_mb}MB limit")
+    try:
+        result = subprocess.run(_media_probe_command(video_path), check=True, capture_output=True)
+        cmd = _plan_size_reduction(video_path, output_path, max_size_mb, json.loads(result.stdout))
+    except (subprocess.SubprocessError, ValueError, KeyError) as e:
+        logger.error(f"Error probing video: {str(e)}")
         return video_path
 
-    logger.info(f"Video size is {file_size_mb:.2f}MB, exceeding the {max_size_mb}MB limit. Reducing resolution...")
+    if cmd is None:
+        return video_path
 
-    # Create a temporary file for the reduced video
-    file_dir = os.path.dirname(video_path)
-    file_name = os.path.basename(video_path)
-    base_name, ext = os.path.splitext(file_name)
+    try:
+        subprocess.run(cmd, check=True, capture_output=True)
+    except subprocess.SubprocessError as e:
+        logger.error(f"Error reducing video size: {str(e)}")
+        # If we encounter an error, return the original file
+        return video_path
 
-    output_path = os.path.join(file_dir, f"{base_name}_reduced{ext}")
+    return _log_reduced_size(output_path, max_size_mb)
 
-    # Try progressively lower resolutions until we get under the size limit
-    # Resolutions for different formats:
-    # - Portrait (9:16) for TikTok, Instagram Reels, YouTube Shorts
-    resolutions = ['1080:1920', '720:1280', '540:960', '360:640']
 
-    for resolution in resolutions:
-        try:
-            # Try to reduce the video resolution using ffmpeg
-            cmd = [
-                'ffmpeg', '-y', '-i', video_path,
-                '-vf', f'scale={resolution}',
-                '-c:v', 'libx264', '-preset', 'fast', '-crf', '28',
-                '-c:a', 'aac', '-b:a', '128k', output_path
-            ]
-
-            subprocess.run(cmd, check=True, capture_output=True)
-
-            # Check if the new file is under the size limit
-            new_size_bytes = os.path.getsize(output_path)
-            new_size_mb = new_size_bytes / (1024 * 1024)
-
-            if new_size_mb <= max_size_mb:
-                logger.info(f"Successfully reduced video to {new_size_mb:.2f}MB with resolution {resolution}")
-                return output_path
-
-            logger.info(
-                f"Video still too large ({new_size_mb:.2f}MB) after reducing to {resolution}. Trying lower resolution."
-            )
+async def async_ensure_video_under_size_limit(video_path: str, max_size_mb: float = 50.0) -> str:
+    """
+    Checks if a video is under the size limit and re-encodes it to fit if needed (async version).
+
+    Args:
+        video_path (str): Path to the video file
+        max_size_mb (float): Maximum file size in MB (default is 50MB for Telegram)
+
+    Returns:
+        str: Path to the video file that's under the size limit (could be original or processed)
+    """
+    if not _needs_size_reduction(video_path, max_size_mb):
+        return video_path
+
+    output_path = _reduced_output_path(video_path)
+
+    try:
+        probe = json.loads(await _run_subprocess_async(_media_probe_command(video_path)))
+        cmd = _plan_size_reduction(video_path, output_path, max_size_mb, probe)
+    except (subprocess.SubprocessError, ValueError, KeyError) as e:
+        logger.error(f"Error probing video: {str(e)}")
+        return video_path
 
-        except subprocess.SubprocessError as e:
-            logger.error(f"Error reducing video resolution: {str(e)}")
-            # If we encounter an error, return the original file
-            return video_path
+    if cmd is None:
+        return video_path
 
-    # If we've tried all resolutions and still can't get under the limit
-    if os.path.exists(output_path):
-        logger.warning("Could not reduce video below size limit, but returning the smallest version created")
-        return output_path
+    try:
+        await _run_subprocess_async(cmd)
+    except subprocess.SubprocessError as e:
+        logger.error(f"Error reducing video size: {str(e)}")
+        # If we encounter an error, return the original file
+        return video_path
 
-    logger.warning("Failed to reduce video size, returning original")
-    return video_path
+    return _log_reduced_size(output_path, max_size_mb)
 
 
 async def async_send_video_to_telegram(
@@ -234,9 +459,6 @@ async def async_send_video_to_telegram(
     token = bot_token or os.environ.get("TELEGRAM_BOT_TOKEN")
     target_chat_id = chat_id or os.environ.get("TELEGRAM_CHAT_ID")
 
-    # Check and possibly reduce video size to meet Telegram's 50MB limit
-    video_path = ensure_video_under_size_limit(video_path, max_size_mb)
-
     if not token:
         logger.error(
             "No Telegram bot token provided. Set TELEGRAM_BOT_TOKEN environment variable "
@@ -250,11 +472,12 @@ async def async_send_video_to_telegram(
         )
         return False
 
+    # Check and possibly reduce video size to meet Telegram's 50MB limit
+    video_path = await async_ensure_video_under_size_limit(video_path, max_size_mb)
+
     # Initialize bot and send video
     bot = TelegramBot(token, target_chat_id)
-    # Ensure video is under size limit before sending
-    processed_video_path = ensure_video_under_size_limit(video_path)
-    return await bot.send_video_async(processed_video_path, target_chat_id, caption)
+    return await bot.send_video_async(video_path, target_chat_id, caption)
 
 
 def send_video_to_telegram(
@@ -352,6 +575,41 @@ def send_text_to_telegram(
     ))
 
 
+async def async_send_batch_to_telegram(items: List[Dict[str, Any]]) -> List[bool]:
+    """
+    Send several videos and/or text messages to Telegram concurrently (async version).
+
+    Args:
+        items (list): Keyword arguments for each message. Items with a 'video_path' key are
+            passed to async_send_video_to_telegram, all others to async_send_text_to_telegram.
+
+    Returns:
+        list: Success flag for each item, in the same order
+    """
+    # One session for the whole batch, closed once every send is done
+    async with http_session_scope():
+        return list(await asyncio.gather(*[
+            async_send_video_to_telegram(**item) if "video_path" in item else async_send_text_to_telegram(**item)
+            for item in items
+        ]))
+
+
+def send_batch_to_telegram(items: List[Dict[str, Any]]) -> List[bool]:
+    """
+    Send several videos and/or text messages to Telegram concurrently (synchronous wrapper).
+
+    Prefer this over calling send_video_to_telegram/send_text_to_telegram in a loop:
+    the deliveries overlap and only one event loop is created.
+
+    Args:
+        items (list): Keyword arguments for each message, see async_send_batch_to_telegram
+
+    Returns:
+        list: Success flag for each item, in the same order
+    """
+    return asyncio.run(async_send_batch_to_telegram(items))
+
+
 if __name__ == "__main__":
     # Example usage
     import argparse
@@ -1,58 +1,249 @@
 """aws_poly.py - Converts input text to speech audio using AWS Polly service"""
 import logging
+import os
+import re
+import shutil
 import subprocess
-from typing import Optional
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional
+from urllib.parse import unquote, urlparse
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+from tts.cache import cache_key, copy_from_cache, save_to_cache
+from tts.ffmpeg import ensure_ffmpeg
 
 logger = logging.getLogger(__name__)
 
+# Polly's synthesize_speech limit per request; shorter texts are rendered in
+# one piece, longer ones are split at sentence boundaries into chunks this size
+POLLY_MAX_CHARS = 3000
+MAX_CONCURRENT_CHUNKS = 4
+
+# With an S3 bucket configured, texts longer than this use an asynchronous synthesis task
+TASK_THRESHOLD_CHARS = 1500
+TASK_POLL_INTERVAL = 0.5
+TASK_TIMEOUT = 300
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_into_chunks(text: str, max_chars: int = POLLY_MAX_CHARS) -> List[str]:
+    """
+    Split text at sentence boundaries into chunks of at most max_chars.
+
+    A single sentence longer than max_chars becomes its own chunk.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _concat_parts(part_paths: List[str], output_path: str, tmp_dir: str):
+    """Join mp3 parts with ffmpeg's concat demuxer, which copies the streams without re-encoding."""
+    list_path = os.path.join(tmp_dir, "parts.txt")
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.writelines(f"file '{path}'\n" for path in part_paths)
+
+    subprocess.run(
+        ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+
+
+@lru_cache(maxsize=1)
+def _polly_client():
+    """
+    Return the Polly client shared by all generators in this process.
+
+    boto3 clients are thread-safe, so sharing one avoids repeated credential and
+    endpoint resolution and lets concurrent requests reuse pooled connections.
+    """
+    return boto3.client(
+        'polly',
+        config=Config(max_pool_connections=32, retries={'mode': 'adaptive', 'total_max_attempts': 5}),
+    )
+
+
+@lru_cache(maxsize=1)
+def _s3_client():
+    """Return the S3 client used to fetch the output of synthesis tasks."""
+    return boto3.client('s3', config=Config(max_pool_connections=16))
+
 
 class TextToSpeechGenerator:
     """Converts text to speech audio files using AWS Polly service."""
 
-    def __init__(self, voice_id: str = "Joanna", engine: str = "neural"):
+    def __init__(
+        self,
+        voice_id: str = "Joanna",
+        engine: str = "neural",
+        sample_rate: str = "22050",
+        s3_bucket: Optional[str] = None,
+    ):
         """
         Initialize the AWS Polly text-to-speech generator.
 
         Args:
             voice_id: The AWS Polly voice to use (default: "Joanna")
             engine: The AWS Polly engine to use (standard, neural, or long-form)
+            sample_rate: mp3 sample rate in Hz (Polly accepts 8000, 16000, 22050 or 24000)
+            s3_bucket: Bucket for asynchronous synthesis tasks on long texts
+                       (default: POLLY_S3_BUCKET environment variable; unset disables them)
         """
         logger.info(f"Initializing AwsPollyTTS with voice {voice_id} and engine {engine}")
         self.voice_id = voice_id
         self.engine = engine
+        self.sample_rate = sample_rate
+        self.s3_bucket = s3_bucket or os.environ.get("POLLY_S3_BUCKET")
         self._check_dependencies()
-        self.polly_client = boto3.client('polly')
+        self.polly_client = _polly_client()
 
     def _check_dependencies(self):
         """Check if required dependencies are installed."""
-        try:
-            # Check if ffmpeg is available for audio processing
-            subprocess.run(["ffmpeg", "-version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.info("ffmpeg is available")
-        except (subprocess.SubprocessError, FileNotFoundError):
-            logger.error("ffmpeg is not installed or not in PATH")
-            raise RuntimeError(
-                "ffmpeg is required but not found. Please install ffmpeg and make sure it's in your PATH."
-            )
+        ensure_ffmpeg()
 
     def generate_speech(self, text: str, output_path: Optional[str] = None) -> str:
+        # Identical requests are served from the on-disk cache
+        key = cache_key("polly", self.voice_id, self.engine, "mp3", self.sample_rate, text)
+        if copy_from_cache(key, output_path):
+            return output_path
+
         # Generate speech with AWS Polly
         try:
-            response = self.polly_client.synthesize_speech(
-                Text=text,
-                OutputFormat='mp3',
-                VoiceId=self.voice_id,
-                Engine=self.engine
-            )
-
-            # Save the audio stream to the file
-            if "AudioStream" in response:
-                with open(output_path, 'wb') as file:
-                    file.write(response['AudioStream'].read())
+            if self.s3_bucket and len(text) > TASK_THRESHOLD_CHARS:
+                self.generate_speech_streaming(text, output_path)
+            elif len(text) > POLLY_MAX_CHARS:
+                self._synthesize_chunked(text, output_path)
+            else:
+                self._synthesize_to_file(text, output_path)
+            save_to_cache(key, output_path)
 
             logger.info(f"Speech audio saved to: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Error generating speech with AWS Polly: {str(e)}")
             raise
+
+    def _synthesize_to_file(self, text: str, output_path: str):
+        """Synthesize text with a single Polly request and write the mp3 to output_path."""
+        response = self.polly_client.synthesize_speech(
+            Text=text,
+            TextType='text',
+            OutputFormat='mp3',
+            SampleRate=self.sample_rate,
+            VoiceId=self.voice_id,
+            Engine=self.engine
+        )
+
+        # Write the stream in chunks as it arrives instead of buffering the whole mp3
+        with open(output_path, 'wb', buffering=64 * 1024) as file:
+            shutil.copyfileobj(response['AudioStream'], file, length=64 * 1024)
+
+    def generate_speech_streaming(self, text: str, output_path: str) -> str:
+        """
+        Synthesize text with a Polly synthesis task and download the result from S3.
+
+        Tasks accept far longer texts than synthesize_speech and render in one
+        piece, and the finished mp3 is fetched with a parallel ranged download.
+        The S3 object is deleted afterwards.
+
+        Args:
+            text: The text to convert to speech
+            output_path: Path to save the output audio file
+
+        Returns:
+            Path to the generated audio file
+        """
+        task = self.polly_client.start_speech_synthesis_task(
+            Text=text,
+            TextType='text',
+            OutputFormat='mp3',
+            SampleRate=self.sample_rate,
+            VoiceId=self.voice_id,
+            Engine=self.engine,
+            OutputS3BucketName=self.s3_bucket,
+            OutputS3KeyPrefix='polly/',
+        )['SynthesisTask']
+        logger.info(f"Started Polly synthesis task {task['TaskId']} for {len(text)} chars")
+
+        deadline = time.monotonic() + TASK_TIMEOUT
+        while task['TaskStatus'] not in ('completed', 'failed'):
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Polly synthesis task {task['TaskId']} timed out")
+            time.sleep(TASK_POLL_INTERVAL)
+            task = self.polly_client.get_speech_synthesis_task(TaskId=task['TaskId'])['SynthesisTask']
+
+        if task['TaskStatus'] == 'failed':
+            raise RuntimeError(f"Polly synthesis task failed: {task.get('TaskStatusReason')}")
+
+        # OutputUri is path-style: https://s3.<region>.amazonaws.com/<bucket>/<key>
+        s3_key = unquote(urlparse(task['OutputUri']).path.split('/', 2)[2])
+        s3 = _s3_client()
+        with open(output_path, 'wb') as file:
+            s3.download_fileobj(
+                self.s3_bucket, s3_key, file,
+                Config=TransferConfig(multipart_chunksize=8 * 1024 * 1024, max_concurrency=8),
+            )
+        s3.delete_object(Bucket=self.s3_bucket, Key=s3_key)
+        return output_path
+
+    def _synthesize_chunked(self, text: str, output_path: str):
+        """
+        Synthesize long text as concurrent sentence-aligned requests and join the results.
+
+        The mp3 parts are concatenated with ffmpeg's concat demuxer, which copies
+        the streams without re-encoding.
+        """
+        chunks = _split_into_chunks(text)
+        logger.info(f"Synthesizing {len(text)} chars as {len(chunks)} concurrent chunks")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            part_paths = [os.path.join(tmp_dir, f"part{i}.mp3") for i in range(len(chunks))]
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHUNKS) as executor:
+                # list() re-raises the first failed request
+                list(executor.map(self._synthesize_to_file, chunks, part_paths))
+
+            _concat_parts(part_paths, output_path, tmp_dir)
+
+    def generate_speech_incremental(self, sentences: Iterable[str], output_path: str) -> Optional[str]:
+        """
+        Synthesize text that arrives a sentence at a time, e.g. from a streaming LLM.
+
+        Each sentence is sent to Polly as soon as it arrives, so synthesis overlaps
+        with producing the rest of the text; the parts are joined in order at the end.
+
+        Args:
+            sentences: Sentences of the text, in order
+            output_path: Path to save the output audio file
+
+        Returns:
+            Path to the generated audio file, or None if no sentences arrived
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CHUNKS) as executor:
+                futures = [
+                    executor.submit(self.generate_speech, sentence, os.path.join(tmp_dir, f"part{i}.mp3"))
+                    for i, sentence in enumerate(sentences)
+                ]
+                # result() re-raises the first failed request
+                part_paths = [future.result() for future in futures]
+
+            if not part_paths:
+                return None
+            logger.info(f"Synthesized {len(part_paths)} sentences as they were generated")
+            _concat_parts(part_paths, output_path, tmp_dir)
+
+        return output_path
@@ -0,0 +1,96 @@
+"""cache.py - Content-addressed on-disk cache for synthesized speech"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Where synthesized audio is kept between runs
+TTS_CACHE_DIR = os.path.expanduser(os.environ.get("TTS_CACHE_DIR", "~/.cache/tts"))
+
+
+def cache_key(*parts: str) -> str:
+    """
+    Build a cache key from everything that affects the synthesized audio.
+
+    Args:
+        parts: Engine, voice, format, text, ...
+
+    Returns:
+        Hex sha256 digest of the parts
+    """
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(TTS_CACHE_DIR, key + ".mp3")
+
+
+def _fast_copy(src: str, dst: str):
+    """
+    Copy a file, letting the kernel do it with copy_file_range where supported.
+
+    On copy-on-write filesystems (Btrfs, XFS) this can be a reflink; other
+    platforms and filesystems fall back to a plain buffered copy.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+def copy_from_cache(key: str, output_path: str) -> bool:
+    """
+    Copy cached audio to output_path.
+
+    Args:
+        key: Cache key from cache_key()
+        output_path: Where to write the audio
+
+    Returns:
+        True on a cache hit, False otherwise
+    """
+    cached = _cache_path(key)
+    if not os.path.exists(cached):
+        return False
+
+    _fast_copy(cached, output_path)
+    logger.info(f"Speech audio copied from cache: {output_path}")
+    return True
+
+
+def save_to_cache(key: str, audio_path: str):
+    """
+    Store a synthesized audio file in the cache.
+
+    The file is copied next to its final name and renamed into place, so
+    concurrent writers never expose a partial file. Failures are logged and
+    otherwise ignored, since the audio itself was already produced.
+
+    Args:
+        key: Cache key from cache_key()
+        audio_path: Path of the audio file to store
+    """
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=TTS_CACHE_DIR)
+        try:
+            with os.fdopen(fd, "wb") as tmp, open(audio_path, "rb") as src:
+                shutil.copyfileobj(src, tmp)
+            os.replace(tmp_path, _cache_path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not cache speech audio: {str(e)}")
@@ -0,0 +1,20 @@
+"""ffmpeg.py - Shared ffmpeg availability check for the TTS engines"""
+import logging
+import subprocess
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def ensure_ffmpeg():
+    """Check that ffmpeg is available; succeeds at most once per process."""
+    try:
+        # Check if ffmpeg is available for audio processing
+        subprocess.run(["ffmpeg", "-version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        logger.info("ffmpeg is available")
+    except (subprocess.SubprocessError, FileNotFoundError):
+        logger.error("ffmpeg is not installed or not in PATH")
+        raise RuntimeError(
+            "ffmpeg is required but not found. Please install ffmpeg and make sure it's in your PATH."
+        )
@@ -1,10 +1,12 @@
 """text_to_speech.py - Converts input text to speech audio using a TTS engine"""
 import logging
 import os
-import subprocess
 import tempfile
 from typing import Optional
 
+from tts.cache import cache_key, copy_from_cache, save_to_cache
+from tts.ffmpeg import ensure_ffmpeg
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,15 +19,7 @@ class TextToSpeechGenerator:
 
     def _check_dependencies(self):
         """Check if required dependencies are installed."""
-        try:
-            # Check if ffmpeg is available for audio processing
-            subprocess.run(["ffmpeg", "-version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.info("ffmpeg is available")
-        except (subprocess.SubprocessError, FileNotFoundError):
-            logger.error("ffmpeg is not installed or not in PATH")
-            raise RuntimeError(
-                "ffmpeg is required but not found. Please install ffmpeg and make sure it's in your PATH."
-            )
+        ensure_ffmpeg()
 
     def generate_speech(self, text: str, output_path: Optional[str] = None) -> str:
         """
@@ -48,17 +42,26 @@ class TextToSpeechGenerator:
 
         # Create a temporary file if output path is not provided
         if output_path is None:
-            output_path = tempfile.mktemp(suffix=".mp3")
+            # Create the file atomically (mktemp only picks a name, leaving a race);
+            # it outlives this call, so close it and let the caller own it
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
+                output_path = tmp.name
 
         # Ensure the output directory exists
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
+        # Identical requests are served from the on-disk cache
+        key = cache_key("gtts", "en", text)
+        if copy_from_cache(key, output_path):
+            return output_path
+
         # Generate speech with gTTS
         try:
             tts = gTTS(text=text, lang="en", slow=False,)
             tts.save(output_path)
+            save_to_cache(key, output_path)
             logger.info(f"Speech audio saved to: {output_path}")
             return output_path
         except Exception as e:
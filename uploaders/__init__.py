@@ -1,10 +1,30 @@
 """
 Social media uploaders for automated video distribution.
+
+Uploaders are imported on first access, so importing this package doesn't
+pull in every platform SDK.
 """
 
-from uploaders.facebook.facebook_uploader import FacebookUploader
-from uploaders.instagram.instagram_uploader import InstagramUploader
-from uploaders.tiktok.tiktok_uploader import TikTokUploader
-from uploaders.youtube.youtube_uploader import YouTubeUploader
+import importlib
+
+_UPLOADER_MODULES = {
+    "FacebookUploader": "uploaders.facebook.facebook_uploader",
+    "InstagramUploader": "uploaders.instagram.instagram_uploader",
+    "TikTokUploader": "uploaders.tiktok.tiktok_uploader",
+    "YouTubeUploader": "uploaders.youtube.youtube_uploader",
+}
 
 __all__ = ["FacebookUploader", "InstagramUploader", "TikTokUploader", "YouTubeUploader"]
+
+
+def __getattr__(name):
+    if name not in _UPLOADER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    uploader = getattr(importlib.import_module(_UPLOADER_MODULES[name]), name)
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = uploader
+    return uploader
+
+
+def __dir__():
+    return __all__
@@ -3,15 +3,63 @@ Base uploader class for social media platforms.
 """
 
 from abc import ABC, abstractmethod
+import asyncio
+import functools
+import logging
 import os
+from dataclasses import fields
 from typing import Dict, Optional, List
 
+import requests
+
+# Prefer orjson for parsing credentials files, fall back to the standard library
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_credentials(path: str, mtime_ns: int) -> Dict:
+    """Parse a credentials file; cached per (path, modification time)."""
+    # Both parsers take UTF-8 bytes directly, so skip the text decoder
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+class CredentialStore:
+    """Parsed credential files, re-read only when the file changes on disk."""
+
+    @staticmethod
+    def get(path: str) -> Dict:
+        """
+        Return the credentials stored in a JSON file.
+
+        Args:
+            path: Path to the credentials file
+
+        Returns:
+            A copy of the parsed credentials, safe for the caller to modify
+        """
+        return dict(_load_credentials(os.path.abspath(path), os.stat(path).st_mtime_ns))
+
 
 class BaseUploader(ABC):
     """Base class for all social media uploaders."""
 
+    # Uploaders are created per distributor; fixed slots skip a __dict__ each
+    __slots__ = ("authenticated", "credentials", "creds", "session", "api_url")
+
+    # Frozen dataclass each platform parses its credentials into
+    CREDENTIALS_CLASS = None
+
     def __init__(
-        self, credentials_file: Optional[str] = None, credentials: Optional[Dict] = None
+        self,
+        credentials_file: Optional[str] = None,
+        credentials: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the uploader with credentials.
@@ -19,24 +67,42 @@ class BaseUploader(ABC):
         Args:
             credentials_file: Path to JSON file containing credentials
             credentials: Dictionary with credential information
+            session: HTTP session to send API requests through; pass a shared one
+                     so uploaders reuse pooled keep-alive connections
         """
         self.authenticated = False
         self.credentials = {}
+        self.session = session or requests.Session()
 
         if credentials_file and os.path.exists(credentials_file):
             self._load_credentials_from_file(credentials_file)
         elif credentials:
             self.credentials = credentials
 
+        self.creds = self._parse_credentials()
+
+    def _parse_credentials(self):
+        """
+        Parse the credentials dictionary into the platform's CREDENTIALS_CLASS.
+
+        Done once at construction so authenticate() and uploads read plain
+        attributes; unknown keys are ignored and missing ones become None.
+
+        Returns:
+            CREDENTIALS_CLASS instance, or None if the platform doesn't define one
+        """
+        if self.CREDENTIALS_CLASS is None:
+            return None
+        return self.CREDENTIALS_CLASS(
+            **{field.name: self.credentials.get(field.name) for field in fields(self.CREDENTIALS_CLASS)}
+        )
+
     def _load_credentials_from_file(self, credentials_file: str) -> None:
         """Load credentials from a JSON file."""
-        import json
-
         try:
-            with open(credentials_file, "r") as f:
-                self.credentials = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading credentials: {e}")
+            self.credentials = CredentialStore.get(credentials_file)
+        except (ValueError, IOError) as e:
+            logger.error("Error loading credentials: %s", e)
 
     @abstractmethod
     def authenticate(self) -> bool:
@@ -50,6 +116,9 @@ class BaseUploader(ABC):
         title: str,
         description: str,
         tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
         **kwargs,
     ) -> str:
         """
@@ -60,8 +129,45 @@ class BaseUploader(ABC):
             title: Video title
             description: Video description
             tags: List of tags/hashtags
+            skip_exists_check: Skip the file check when the caller already made it
+            hashtags: Hashtag string already built from tags, e.g. "#a #b"
             **kwargs: Platform-specific arguments
         Returns:
             URL or ID of the uploaded video
         """
         pass
+
+    async def upload_video_async(
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """
+        Upload a video without blocking the event loop.
+
+        The default runs upload_video in the loop's default thread pool;
+        uploaders with a native async client can override this.
+
+        Returns:
+            URL or ID of the uploaded video
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.upload_video,
+                video_path,
+                title,
+                description,
+                tags,
+                skip_exists_check=skip_exists_check,
+                hashtags=hashtags,
+                **kwargs,
+            ),
+        )
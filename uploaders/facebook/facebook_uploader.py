@@ -2,17 +2,38 @@
 Facebook video uploader module.
 """
 
+import logging
 import os
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+import requests
+
 from uploaders.base_uploader import BaseUploader
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FacebookCredentials:
+    """Facebook API credentials, parsed once when the uploader is created."""
+
+    access_token: Optional[str] = None
+    page_id: Optional[str] = None
+
 
 class FacebookUploader(BaseUploader):
     """Class for uploading videos to Facebook."""
 
+    __slots__ = ()
+
+    CREDENTIALS_CLASS = FacebookCredentials
+
     def __init__(
-        self, credentials_file: Optional[str] = None, credentials: Optional[Dict] = None
+        self,
+        credentials_file: Optional[str] = None,
+        credentials: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the Facebook uploader with credentials.
@@ -21,7 +42,7 @@ class FacebookUploader(BaseUploader):
         1. Facebook App with appropriate permissions
         2. Page access token with publish_video permission
         """
-        super().__init__(credentials_file, credentials)
+        super().__init__(credentials_file, credentials, session)
         self.api_url = "https://graph.facebook.com/v19.0"
 
     def authenticate(self) -> bool:
@@ -32,20 +53,18 @@ class FacebookUploader(BaseUploader):
             bool: True if authentication was successful
         """
         # Simple check - in a real implementation, you would validate the token
-        if not self.credentials.get("access_token") or not self.credentials.get(
-            "page_id"
-        ):
-            print("Missing Facebook API credentials")
+        if not self.creds.access_token or not self.creds.page_id:
+            logger.warning("Missing Facebook API credentials")
             return False
 
         try:
             # In a real implementation, this would validate the token with Facebook
             # This is a simplified placeholder
-            print("Successfully authenticated with Facebook")
+            logger.info("Successfully authenticated with Facebook")
             self.authenticated = True
             return True
         except Exception as e:
-            print(f"Facebook authentication error: {e}")
+            logger.error("Facebook authentication error: %s", e)
             return False
 
     def upload_video(
@@ -54,6 +73,9 @@ class FacebookUploader(BaseUploader):
         title: str,
         description: str,
         tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
         **kwargs,
     ) -> str:
         """
@@ -64,6 +86,8 @@ class FacebookUploader(BaseUploader):
             title: Video title
             description: Video description
             tags: Not directly used by Facebook but can be included in description
+            skip_exists_check: Skip the file check when the caller already made it
+            hashtags: Not used by Facebook
             **kwargs: Additional parameters like:
                      - scheduled_publish_time: UNIX timestamp for scheduling
                      - targeting: Dict with audience targeting options
@@ -75,17 +99,17 @@ class FacebookUploader(BaseUploader):
             if not self.authenticate():
                 return "Authentication failed"
 
-        if not os.path.exists(video_path):
+        if not skip_exists_check and not os.path.exists(video_path):
             return f"Error: File not found: {video_path}"
 
-        page_id = self.credentials.get("page_id")
+        page_id = self.creds.page_id
         schedule_time = kwargs.get("scheduled_publish_time")
 
-        print(f"Simulating Facebook upload to page {page_id}: {video_path}")
-        print(f"Title: {title}")
-        print(f"Description: {description}")
+        logger.debug("Simulating Facebook upload to page %s: %s", page_id, video_path)
+        logger.debug("Title: %s", title)
+        logger.debug("Description: %s", description)
         if schedule_time:
-            print(f"Scheduled for: {schedule_time}")
+            logger.debug("Scheduled for: %s", schedule_time)
 
         # In a real implementation, this would use the Facebook Graph API
         # with proper authentication and upload processes
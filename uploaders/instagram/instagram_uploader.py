@@ -2,17 +2,38 @@
 Instagram video uploader module.
 """
 
+import logging
 import os
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+import requests
+
 from uploaders.base_uploader import BaseUploader
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InstagramCredentials:
+    """Instagram API credentials, parsed once when the uploader is created."""
+
+    access_token: Optional[str] = None
+    instagram_account_id: Optional[str] = None
+
 
 class InstagramUploader(BaseUploader):
     """Class for uploading videos to Instagram."""
 
+    __slots__ = ()
+
+    CREDENTIALS_CLASS = InstagramCredentials
+
     def __init__(
-        self, credentials_file: Optional[str] = None, credentials: Optional[Dict] = None
+        self,
+        credentials_file: Optional[str] = None,
+        credentials: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the Instagram uploader with credentials.
@@ -22,7 +43,7 @@ class InstagramUploader(BaseUploader):
         2. Connected Facebook page
         3. Access token with instagram_basic and instagram_content_publish permissions
         """
-        super().__init__(credentials_file, credentials)
+        super().__init__(credentials_file, credentials, session)
         self.api_url = "https://graph.facebook.com/v19.0"
 
     def authenticate(self) -> bool:
@@ -33,20 +54,18 @@ class InstagramUploader(BaseUploader):
             bool: True if authentication was successful
         """
         # Simple check - in a real implementation, you would validate the token
-        if not self.credentials.get("access_token") or not self.credentials.get(
-            "instagram_account_id"
-        ):
-            print("Missing Instagram API credentials")
+        if not self.creds.access_token or not self.creds.instagram_account_id:
+            logger.warning("Missing Instagram API credentials")
             return False
 
         try:
             # In a real implementation, this would validate the token
             # This is a simplified placeholder
-            print("Successfully authenticated with Instagram")
+            logger.info("Successfully authenticated with Instagram")
             self.authenticated = True
             return True
         except Exception as e:
-            print(f"Instagram authentication error: {e}")
+            logger.error("Instagram authentication error: %s", e)
             return False
 
     def upload_video(
@@ -55,6 +74,9 @@ class InstagramUploader(BaseUploader):
         title: str,
         description: str,
         tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
         **kwargs,
     ) -> str:
         """
@@ -65,6 +87,8 @@ class InstagramUploader(BaseUploader):
             title: Not used directly (Instagram doesn't have titles)
             description: Caption for the post
             tags: List of hashtags to append to the caption
+            skip_exists_check: Skip the file check when the caller already made it
+            hashtags: Hashtag string already built from tags, e.g. "#a #b"
             **kwargs: Additional parameters like:
                      - location_id: Instagram location ID
                      - carousel_items: Additional media for carousel posts
@@ -76,21 +100,19 @@ class InstagramUploader(BaseUploader):
             if not self.authenticate():
                 return "Authentication failed"
 
-        if not os.path.exists(video_path):
+        if not skip_exists_check and not os.path.exists(video_path):
             return f"Error: File not found: {video_path}"
 
         # Format caption with hashtags
         caption = description
         if tags:
-            hashtags = " ".join([f"#{tag}" for tag in tags])
+            hashtags = hashtags or "#" + " #".join(tags)
             caption = f"{description}\n\n{hashtags}"
 
-        instagram_account_id = self.credentials.get("instagram_account_id")
+        instagram_account_id = self.creds.instagram_account_id
 
-        print(
-            f"Simulating Instagram upload for account {instagram_account_id}: {video_path}"
-        )
-        print(f"Caption: {caption}")
+        logger.debug("Simulating Instagram upload for account %s: %s", instagram_account_id, video_path)
+        logger.debug("Caption: %s", caption)
 
         # In a real implementation, this would use the Instagram Graph API
         # with proper authentication and the Container approach (create container, upload, publish)
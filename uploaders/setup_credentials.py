@@ -6,21 +6,39 @@ This script helps securely store and manage credentials for different social med
 import argparse
 import json
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+# Prefer orjson for writing credentials files, fall back to the standard library
+try:
+    import orjson
 
-def create_credentials_directory() -> str:
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_compact(obj: dict) -> bytes:
+    """Serialize obj as compact UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def create_credentials_directory() -> Path:
     """
     Create a directory for storing credentials if it doesn't exist.
 
     Returns:
-        str: Path to the credentials directory
+        Path: Path to the credentials directory
     """
     # Create credentials directory in user's home directory
-    credentials_dir = os.path.expanduser("~/.audo-captions/credentials")
-    os.makedirs(credentials_dir, exist_ok=True)
+    credentials_dir = Path("~/.audo-captions/credentials").expanduser()
+    credentials_dir.mkdir(parents=True, exist_ok=True)
 
     # Set restrictive permissions
-    os.chmod(credentials_dir, 0o700)
+    credentials_dir.chmod(0o700)
 
     return credentials_dir
 
@@ -134,7 +152,7 @@ def setup_tiktok_credentials() -> dict:
     }
 
 
-def save_credentials(platform: str, credentials: dict, credentials_dir: str) -> str:
+def save_credentials(platform: str, credentials: dict, credentials_dir: Path) -> Path:
     """
     Save credentials to a JSON file.
 
@@ -144,18 +162,49 @@ def save_credentials(platform: str, credentials: dict, credentials_dir: str) ->
         credentials_dir: Directory to save credentials in
 
     Returns:
-        str: Path to the saved file
+        Path: Path to the saved file
     """
-    filename = f"{platform}_credentials.json"
-    filepath = os.path.join(credentials_dir, filename)
+    filepath = Path(credentials_dir) / f"{platform}_credentials.json"
+
+    # Write to a private temp file and rename it into place, so the file is
+    # never world-readable and readers never see a partial write
+    fd, tmp_path = tempfile.mkstemp(dir=credentials_dir, prefix=f".{platform}_", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps_compact(credentials))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
-    with open(filepath, "w") as f:
-        json.dump(credentials, f, indent=2)
+    return filepath
 
-    # Set restrictive file permissions
-    os.chmod(filepath, 0o600)
 
-    return filepath
+# Interactive setup function for each platform
+CREDENTIAL_SETUP = {
+    "youtube": setup_youtube_credentials,
+    "facebook": setup_facebook_credentials,
+    "instagram": setup_instagram_credentials,
+    "tiktok": setup_tiktok_credentials,
+}
+
+
+def validate_credentials(platform: str, credentials: dict) -> bool:
+    """
+    Check credentials by authenticating with the platform's uploader.
+
+    Args:
+        platform: Platform name
+        credentials: Credentials dictionary
+
+    Returns:
+        bool: True if authentication succeeded
+    """
+    # Imported here so interactive setup doesn't load the uploader stack
+    from uploaders.social_media_distributor import get_uploader_class
+
+    return get_uploader_class(platform)(credentials=credentials).authenticate()
 
 
 def main():
@@ -163,31 +212,27 @@ def main():
     parser.add_argument(
         "--platform",
         required=True,
-        choices=["youtube", "facebook", "instagram", "tiktok", "all"],
+        choices=[*CREDENTIAL_SETUP, "all"],
         help="Social media platform to set up credentials for",
     )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check the entered credentials against each platform after setup",
+    )
 
     args = parser.parse_args()
 
     credentials_dir = create_credentials_directory()
     print(f"Credentials will be stored in: {credentials_dir}")
 
-    platforms = (
-        ["youtube", "facebook", "instagram", "tiktok"]
-        if args.platform == "all"
-        else [args.platform]
-    )
+    platforms = list(CREDENTIAL_SETUP) if args.platform == "all" else [args.platform]
 
+    collected = {}
     for platform in platforms:
         try:
-            if platform == "youtube":
-                creds = setup_youtube_credentials()
-            elif platform == "facebook":
-                creds = setup_facebook_credentials()
-            elif platform == "instagram":
-                creds = setup_instagram_credentials()
-            elif platform == "tiktok":
-                creds = setup_tiktok_credentials()
+            creds = CREDENTIAL_SETUP[platform]()
+            collected[platform] = creds
 
             filepath = save_credentials(platform, creds, credentials_dir)
             print(f"✓ {platform.capitalize()} credentials saved to {filepath}")
@@ -197,6 +242,23 @@ def main():
         except Exception as e:
             print(f"\nError setting up {platform} credentials: {e}")
 
+    if args.validate and collected:
+        # Prompts are sequential, but the validation round-trips can overlap
+        print("\nValidating credentials...")
+        with ThreadPoolExecutor(max_workers=len(collected)) as executor:
+            futures = {
+                platform: executor.submit(validate_credentials, platform, creds)
+                for platform, creds in collected.items()
+            }
+            for platform, future in futures.items():
+                try:
+                    ok = future.result(timeout=30)
+                except Exception as e:
+                    print(f"✗ {platform.capitalize()} credentials could not be validated: {e}")
+                    continue
+                status = "valid" if ok else "rejected"
+                print(f"{'✓' if ok else '✗'} {platform.capitalize()} credentials {status}")
+
     print("\nSetup complete! You can now use these credentials with the uploaders.")
     print("Example usage:")
     print("  from uploaders.social_media_distributor import SocialMediaDistributor")
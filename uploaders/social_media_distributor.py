@@ -6,25 +6,57 @@ to create an end-to-end solution for processing videos and uploading them to
 various social media platforms.
 """
 
+import asyncio
+import importlib
 import os
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from stat import S_ISREG
 from typing import Dict, List, Optional, Union
 
-from media_processors.video_processor import VideoProcessor
-from uploaders.facebook import FacebookUploader
-from uploaders.instagram import InstagramUploader
-from uploaders.tiktok import TikTokUploader
-from uploaders.youtube import YouTubeUploader
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 logger = logging.getLogger(__name__)
 
+# Module and class name of the uploader for each supported platform; classes
+# are imported on first use so unused platforms cost nothing at startup
+UPLOADER_REGISTRY = {
+    "youtube": ("uploaders.youtube", "YouTubeUploader"),
+    "facebook": ("uploaders.facebook", "FacebookUploader"),
+    "instagram": ("uploaders.instagram", "InstagramUploader"),
+    "tiktok": ("uploaders.tiktok", "TikTokUploader"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_uploader_class(platform: str) -> type:
+    """
+    Import and return the uploader class for a platform.
+
+    Args:
+        platform: One of the supported platforms ("youtube", "facebook", etc.)
+
+    Returns:
+        The platform's uploader class
+    """
+    module_name, class_name = UPLOADER_REGISTRY[platform]
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 class SocialMediaDistributor:
     """
     Class for processing videos and distributing them to social media platforms.
     """
 
+    __slots__ = ("_video_processor", "credentials_dir", "uploaders", "http")
+
     SUPPORTED_PLATFORMS = ["youtube", "facebook", "instagram", "tiktok"]
 
     def __init__(self, credentials_dir: Optional[str] = None):
@@ -35,41 +67,52 @@ class SocialMediaDistributor:
             credentials_dir: Directory containing platform-specific credential files
                             (e.g., youtube_credentials.json)
         """
-        self.video_processor = VideoProcessor()
+        self._video_processor = None
         self.credentials_dir = credentials_dir
         self.uploaders = {}
 
+        # One connection pool shared by every uploader, so keep-alive connections
+        # (and their TLS sessions) are reused across uploads
+        self.http = requests.Session()
+        self.http.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+            ),
+        )
+
         # Load credentials and initialize uploaders if directory provided
         if credentials_dir and os.path.isdir(credentials_dir):
             self._initialize_uploaders()
 
+    @property
+    def video_processor(self):
+        """VideoProcessor, created on first use so upload-only callers skip the import."""
+        if self._video_processor is None:
+            from media_processors.video_processor import VideoProcessor
+
+            self._video_processor = VideoProcessor()
+        return self._video_processor
+
     def _initialize_uploaders(self):
         """Initialize uploaders with credentials from files."""
+        # One directory listing instead of a stat per platform
+        with os.scandir(self.credentials_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+
         for platform in self.SUPPORTED_PLATFORMS:
-            cred_file = os.path.join(
-                self.credentials_dir, f"{platform}_credentials.json"
-            )
-            if os.path.exists(cred_file):
+            filename = f"{platform}_credentials.json"
+            if filename in present:
+                cred_file = os.path.join(self.credentials_dir, filename)
                 try:
-                    if platform == "youtube":
-                        self.uploaders[platform] = YouTubeUploader(
-                            credentials_file=cred_file
-                        )
-                    elif platform == "facebook":
-                        self.uploaders[platform] = FacebookUploader(
-                            credentials_file=cred_file
-                        )
-                    elif platform == "instagram":
-                        self.uploaders[platform] = InstagramUploader(
-                            credentials_file=cred_file
-                        )
-                    elif platform == "tiktok":
-                        self.uploaders[platform] = TikTokUploader(
-                            credentials_file=cred_file
-                        )
-                    logger.info(f"Initialized {platform} uploader")
+                    self.uploaders[platform] = get_uploader_class(platform)(
+                        credentials_file=cred_file, session=self.http
+                    )
+                    logger.info("Initialized %s uploader", platform)
                 except Exception as e:
-                    logger.error(f"Failed to initialize {platform} uploader: {e}")
+                    logger.error("Failed to initialize %s uploader: %s", platform, e)
 
     def set_credentials(self, platform: str, credentials: Dict):
         """
@@ -82,16 +125,11 @@ class SocialMediaDistributor:
         if platform not in self.SUPPORTED_PLATFORMS:
             raise ValueError(f"Unsupported platform: {platform}")
 
-        if platform == "youtube":
-            self.uploaders[platform] = YouTubeUploader(credentials=credentials)
-        elif platform == "facebook":
-            self.uploaders[platform] = FacebookUploader(credentials=credentials)
-        elif platform == "instagram":
-            self.uploaders[platform] = InstagramUploader(credentials=credentials)
-        elif platform == "tiktok":
-            self.uploaders[platform] = TikTokUploader(credentials=credentials)
+        self.uploaders[platform] = get_uploader_class(platform)(
+            credentials=credentials, session=self.http
+        )
 
-        logger.info(f"Set credentials for {platform}")
+        logger.info("Set credentials for %s", platform)
 
     def process_and_distribute(
         self,
@@ -105,6 +143,37 @@ class SocialMediaDistributor:
         """
         Process a video with subtitles and distribute to multiple platforms.
 
+        Synchronous wrapper around process_and_distribute_async.
+
+        Args:
+            input_video_path: Path to the input video
+            subtitles_path: Path to the subtitles file
+            output_path: Path for saving the processed video
+            platforms: List of platforms to upload to
+            metadata: Video metadata (title, description, tags)
+            platform_options: Platform-specific options for each uploader
+
+        Returns:
+            Dictionary mapping platforms to upload results (URLs or IDs)
+        """
+        return asyncio.run(
+            self.process_and_distribute_async(
+                input_video_path, subtitles_path, output_path, platforms, metadata, platform_options
+            )
+        )
+
+    async def process_and_distribute_async(
+        self,
+        input_video_path: str,
+        subtitles_path: str,
+        output_path: str,
+        platforms: List[str],
+        metadata: Dict[str, Union[str, List[str]]],
+        platform_options: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, str]:
+        """
+        Process a video with subtitles and upload it to all platforms concurrently.
+
         Args:
             input_video_path: Path to the input video
             subtitles_path: Path to the subtitles file
@@ -116,8 +185,15 @@ class SocialMediaDistributor:
         Returns:
             Dictionary mapping platforms to upload results (URLs or IDs)
         """
+        # Authenticate first so bad credentials fail before any video I/O
+        requested = platforms
+        results = await self._preauth(platforms)
+        platforms = [platform for platform in platforms if platform not in results]
+        if not platforms:
+            return results
+
         # Process the video with subtitles
-        logger.info(f"Processing video: {input_video_path}")
+        logger.info("Processing video: %s", input_video_path)
 
         # For demonstration, we're skipping the actual video processing here
         # In a real implementation, you would call the appropriate video processor methods
@@ -126,35 +202,272 @@ class SocialMediaDistributor:
         # For this example, assume output_path exists after processing
         processed_video_path = output_path
 
-        # Upload to each platform
-        results = {}
-        for platform in platforms:
-            if platform not in self.uploaders:
-                logger.warning(f"No uploader configured for {platform}, skipping")
-                results[platform] = f"Error: No uploader configured for {platform}"
-                continue
-
-            uploader = self.uploaders[platform]
-
-            # Get platform-specific options, if any
-            options = platform_options.get(platform, {}) if platform_options else {}
-
-            try:
-                logger.info(f"Uploading to {platform}")
-                result = uploader.upload_video(
-                    video_path=processed_video_path,
-                    title=metadata.get("title", ""),
-                    description=metadata.get("description", ""),
-                    tags=metadata.get("tags", []),
-                    **options,
+        # Check the file once here rather than once per uploader
+        try:
+            stat = os.stat(processed_video_path)
+        except OSError:
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            logger.error("Processed video not found: %s", processed_video_path)
+            results.update((platform, "Error: file not found") for platform in platforms)
+            return {platform: results[platform] for platform in requested}
+        # Built once and shared by every upload
+        tags = metadata.get("tags", [])
+        hashtags = "#" + " #".join(tags) if tags else None
+
+        # Upload to all platforms at once; total time is the slowest upload, not the sum
+        uploads = [
+            self._upload_to_platform(
+                platform,
+                processed_video_path,
+                metadata,
+                platform_options.get(platform, {}) if platform_options else {},
+                skip_exists_check=True,
+                hashtags=hashtags,
+            )
+            for platform in platforms
+        ]
+        results.update(zip(platforms, await asyncio.gather(*uploads)))
+        # Keep the caller's platform order
+        return {platform: results[platform] for platform in requested}
+
+    async def _preauth(self, platforms: List[str]) -> Dict[str, str]:
+        """
+        Authenticate every configured uploader concurrently.
+
+        Args:
+            platforms: Platforms about to be uploaded to
+
+        Returns:
+            Dictionary mapping each platform that failed authentication to its error
+        """
+        pending = [
+            platform
+            for platform in platforms
+            if platform in self.uploaders and not self.uploaders[platform].authenticated
+        ]
+        if not pending:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(
+            *(loop.run_in_executor(None, self.uploaders[platform].authenticate) for platform in pending),
+            return_exceptions=True,
+        )
+
+        failures = {}
+        for platform, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Authentication with %s raised: %s", platform, outcome)
+                failures[platform] = f"Error: {outcome}"
+            elif not outcome:
+                logger.error("Authentication with %s failed", platform)
+                failures[platform] = "Authentication failed"
+        return failures
+
+    async def _upload_to_platform(
+        self,
+        platform: str,
+        video_path: str,
+        metadata: Dict[str, Union[str, List[str]]],
+        options: Dict,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
+    ) -> str:
+        """Upload to a single platform, returning the result or an error string."""
+        if platform not in self.uploaders:
+            logger.warning("No uploader configured for %s, skipping", platform)
+            return f"Error: No uploader configured for {platform}"
+
+        uploader = self.uploaders[platform]
+
+        try:
+            logger.info("Uploading to %s", platform)
+            result = await uploader.upload_video_async(
+                video_path=video_path,
+                title=metadata.get("title", ""),
+                description=metadata.get("description", ""),
+                tags=metadata.get("tags", []),
+                skip_exists_check=skip_exists_check,
+                hashtags=hashtags,
+                **options,
+            )
+            logger.info("Successfully uploaded to %s: %s", platform, result)
+            return result
+        except Exception as e:
+            logger.error("Failed to upload to %s: %s", platform, e)
+            return f"Error: {str(e)}"
+
+    def upload_to_platform(
+        self,
+        platform: str,
+        video_path: str,
+        metadata: Dict[str, Union[str, List[str]]],
+        options: Optional[Dict] = None,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
+    ) -> str:
+        """
+        Upload an already processed video to a single platform, blocking until done.
+
+        Args:
+            platform: One of the configured platforms
+            video_path: Path to the processed video
+            metadata: Video metadata (title, description, tags)
+            options: Platform-specific options for the uploader
+            skip_exists_check: Skip the uploader's file check when the caller already made it
+            hashtags: Hashtag string already built from the tags
+
+        Returns:
+            The upload result (URL or ID), or an error string
+        """
+        options = options or {}
+        if platform not in self.uploaders:
+            logger.warning("No uploader configured for %s, skipping", platform)
+            return f"Error: No uploader configured for {platform}"
+
+        try:
+            logger.info("Uploading to %s", platform)
+            result = self.uploaders[platform].upload_video(
+                video_path=video_path,
+                title=metadata.get("title", ""),
+                description=metadata.get("description", ""),
+                tags=metadata.get("tags", []),
+                skip_exists_check=skip_exists_check,
+                hashtags=hashtags,
+                **options,
+            )
+            logger.info("Successfully uploaded to %s: %s", platform, result)
+            return result
+        except Exception as e:
+            logger.error("Failed to upload to %s: %s", platform, e)
+            return f"Error: {str(e)}"
+
+
+class BatchingDistributor:
+    """
+    Coalesces individual upload requests into batches per platform.
+
+    Requests submitted within max_wait_ms of each other (up to max_batch_size)
+    are flushed together: each platform uploads its queued videos back-to-back
+    on one worker, so connections and auth stay warm, while different
+    platforms run in parallel.
+    """
+
+    def __init__(
+        self,
+        distributor: SocialMediaDistributor,
+        max_batch_size: int = 16,
+        max_wait_ms: int = 500,
+    ):
+        """
+        Initialize the BatchingDistributor.
+
+        Args:
+            distributor: Configured distributor whose uploaders are used
+            max_batch_size: Maximum number of videos flushed together
+            max_wait_ms: How long the first queued video waits for others to join its batch
+        """
+        self.distributor = distributor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="upload-batcher", daemon=True)
+        self._worker.start()
+
+    def submit_async(
+        self,
+        video_path: str,
+        metadata: Dict[str, Union[str, List[str]]],
+        platforms: List[str],
+        platform_options: Optional[Dict[str, Dict]] = None,
+    ) -> Future:
+        """
+        Queue a video for upload.
+
+        Args:
+            video_path: Path to the processed video
+            metadata: Video metadata (title, description, tags)
+            platforms: List of platforms to upload to
+            platform_options: Platform-specific options for each uploader
+
+        Returns:
+            Future resolving to a dictionary mapping platforms to upload results
+        """
+        future = Future()
+        self._queue.put((future, video_path, metadata, platforms, platform_options or {}))
+        return future
+
+    def process_and_distribute(
+        self,
+        video_path: str,
+        platforms: List[str],
+        metadata: Dict[str, Union[str, List[str]]],
+        platform_options: Optional[Dict[str, Dict]] = None,
+    ) -> Dict[str, str]:
+        """Queue a video for upload and wait for its results."""
+        return self.submit_async(video_path, metadata, platforms, platform_options).result()
+
+    def close(self):
+        """Flush anything still queued and stop the background worker."""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        """Collect queued requests into batches and flush them until closed."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch: List[tuple]):
+        """Upload a batch, one worker per platform, and resolve each request's future."""
+        per_platform: Dict[str, List[int]] = {}
+        for index, (_, _, _, platforms, _) in enumerate(batch):
+            for platform in platforms:
+                per_platform.setdefault(platform, []).append(index)
+
+        results: List[Dict[str, str]] = [{} for _ in batch]
+
+        def upload_queue(platform: str):
+            for index in per_platform[platform]:
+                _, video_path, metadata, _, options = batch[index]
+                results[index][platform] = self.distributor.upload_to_platform(
+                    platform, video_path, metadata, options.get(platform, {})
                 )
-                results[platform] = result
-                logger.info(f"Successfully uploaded to {platform}: {result}")
-            except Exception as e:
-                logger.error(f"Failed to upload to {platform}: {e}")
-                results[platform] = f"Error: {str(e)}"
 
-        return results
+        logger.info("Flushing %s queued videos to %s platforms", len(batch), len(per_platform))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(per_platform))) as executor:
+                list(executor.map(upload_queue, per_platform))
+        except Exception as e:
+            for future, *_ in batch:
+                future.set_exception(e)
+            return
+
+        for (future, _, _, platforms, _), result in zip(batch, results):
+            # Keep the caller's platform order
+            future.set_result({platform: result[platform] for platform in platforms})
 
 
 # Example usage
@@ -2,17 +2,39 @@
 TikTok video uploader module.
 """
 
+import logging
 import os
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+import requests
+
 from uploaders.base_uploader import BaseUploader
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TikTokCredentials:
+    """TikTok API credentials, parsed once when the uploader is created."""
+
+    client_key: Optional[str] = None
+    client_secret: Optional[str] = None
+    access_token: Optional[str] = None
+
 
 class TikTokUploader(BaseUploader):
     """Class for uploading videos to TikTok."""
 
+    __slots__ = ()
+
+    CREDENTIALS_CLASS = TikTokCredentials
+
     def __init__(
-        self, credentials_file: Optional[str] = None, credentials: Optional[Dict] = None
+        self,
+        credentials_file: Optional[str] = None,
+        credentials: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the TikTok uploader with credentials.
@@ -22,7 +44,7 @@ class TikTokUploader(BaseUploader):
         2. Access to TikTok API (Content or Marketing API)
         3. App credentials with proper permissions
         """
-        super().__init__(credentials_file, credentials)
+        super().__init__(credentials_file, credentials, session)
         self.api_url = "https://open-api.tiktok.com/v2"
 
     def authenticate(self) -> bool:
@@ -33,20 +55,18 @@ class TikTokUploader(BaseUploader):
             bool: True if authentication was successful
         """
         # Simple check - in a real implementation, you would validate the token
-        if not self.credentials.get("client_key") or not self.credentials.get(
-            "client_secret"
-        ):
-            print("Missing TikTok API credentials")
+        if not self.creds.client_key or not self.creds.client_secret:
+            logger.warning("Missing TikTok API credentials")
             return False
 
         try:
             # In a real implementation, this would use proper OAuth flow
             # This is a simplified placeholder
-            print("Successfully authenticated with TikTok")
+            logger.info("Successfully authenticated with TikTok")
             self.authenticated = True
             return True
         except Exception as e:
-            print(f"TikTok authentication error: {e}")
+            logger.error("TikTok authentication error: %s", e)
             return False
 
     def upload_video(
@@ -55,6 +75,9 @@ class TikTokUploader(BaseUploader):
         title: str,
         description: str,
         tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
         **kwargs,
     ) -> str:
         """
@@ -65,6 +88,8 @@ class TikTokUploader(BaseUploader):
             title: Not used directly (combined with description)
             description: Caption for the video
             tags: List of hashtags to append to the caption
+            skip_exists_check: Skip the file check when the caller already made it
+            hashtags: Hashtag string already built from tags, e.g. "#a #b"
             **kwargs: Additional parameters like:
                      - sound_id: TikTok sound ID to use
                      - brand_content_type: Type of branded content
@@ -76,21 +101,21 @@ class TikTokUploader(BaseUploader):
             if not self.authenticate():
                 return "Authentication failed"
 
-        if not os.path.exists(video_path):
+        if not skip_exists_check and not os.path.exists(video_path):
             return f"Error: File not found: {video_path}"
 
         # Format caption with hashtags
         caption = description
         if tags:
-            hashtags = " ".join([f"#{tag}" for tag in tags])
+            hashtags = hashtags or "#" + " #".join(tags)
             caption = f"{description} {hashtags}"
 
         sound_id = kwargs.get("sound_id")
 
-        print(f"Simulating TikTok upload: {video_path}")
-        print(f"Caption: {caption}")
+        logger.debug("Simulating TikTok upload: %s", video_path)
+        logger.debug("Caption: %s", caption)
         if sound_id:
-            print(f"Using sound ID: {sound_id}")
+            logger.debug("Using sound ID: %s", sound_id)
 
         # In a real implementation, this would use the TikTok Content API
         # with proper authentication and upload processes
@@ -3,6 +3,7 @@ Example script showing how to use the social media uploaders.
 """
 import os
 import argparse
+from pathlib import Path
 from typing import Dict, List
 
 from uploaders.facebook import FacebookUploader
@@ -10,6 +11,18 @@ from uploaders.instagram import InstagramUploader
 from uploaders.tiktok import TikTokUploader
 from uploaders.youtube import YouTubeUploader
 
+UPLOADERS = {
+    "youtube": YouTubeUploader,
+    "facebook": FacebookUploader,
+    "instagram": InstagramUploader,
+    "tiktok": TikTokUploader,
+}
+
+# Extra upload options per platform
+UPLOAD_OPTIONS = {
+    "youtube": {"privacy_status": "private"},  # Start as private for safety
+}
+
 
 def load_credentials(platform: str) -> Dict:
     """
@@ -65,35 +78,24 @@ def upload_to_platform(
     Returns:
         URL or ID of the uploaded video
     """
-    credentials = load_credentials(platform)
-
-    if platform == "youtube":
-        uploader = YouTubeUploader(credentials=credentials)
-        result = uploader.upload_video(
-            video_path=video_path,
-            title=title,
-            description=description,
-            tags=tags,
-            privacy_status="private",  # Start as private for safety
-        )
-    elif platform == "facebook":
-        uploader = FacebookUploader(credentials=credentials)
-        result = uploader.upload_video(
-            video_path=video_path, title=title, description=description, tags=tags
-        )
-    elif platform == "instagram":
-        uploader = InstagramUploader(credentials=credentials)
-        result = uploader.upload_video(
-            video_path=video_path, title=title, description=description, tags=tags
-        )
-    elif platform == "tiktok":
-        uploader = TikTokUploader(credentials=credentials)
-        result = uploader.upload_video(
-            video_path=video_path, title=title, description=description, tags=tags
-        )
-    else:
+    uploader_class = UPLOADERS.get(platform)
+    if uploader_class is None:
         return f"Unsupported platform: {platform}"
 
+    # Check the file here so the uploader can skip its own check
+    if not Path(video_path).is_file():
+        return f"Error: File not found: {video_path}"
+
+    uploader = uploader_class(credentials=load_credentials(platform))
+    result = uploader.upload_video(
+        video_path=video_path,
+        title=title,
+        description=description,
+        tags=tags,
+        skip_exists_check=True,
+        **UPLOAD_OPTIONS.get(platform, {}),
+    )
+
     return result
 
 
@@ -2,16 +2,39 @@
 YouTube video uploader module.
 """
 
+import logging
 import os
+from dataclasses import dataclass
 from typing import Dict, List, Optional
+
+import requests
+
 from uploaders.base_uploader import BaseUploader
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class YouTubeCredentials:
+    """YouTube API credentials, parsed once when the uploader is created."""
+
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    refresh_token: Optional[str] = None
+
 
 class YouTubeUploader(BaseUploader):
     """Class for uploading videos to YouTube."""
 
+    __slots__ = ()
+
+    CREDENTIALS_CLASS = YouTubeCredentials
+
     def __init__(
-        self, credentials_file: Optional[str] = None, credentials: Optional[Dict] = None
+        self,
+        credentials_file: Optional[str] = None,
+        credentials: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the YouTube uploader with credentials.
@@ -22,7 +45,7 @@ class YouTubeUploader(BaseUploader):
         3. Create OAuth credentials
         4. Pass credentials as file or dictionary
         """
-        super().__init__(credentials_file, credentials)
+        super().__init__(credentials_file, credentials, session)
         self.api_url = "https://www.googleapis.com/upload/youtube/v3/videos"
 
     def authenticate(self) -> bool:
@@ -33,20 +56,18 @@ class YouTubeUploader(BaseUploader):
             bool: True if authentication was successful
         """
         # Simple check - in a real implementation, you would validate the token
-        if not self.credentials.get("client_id") or not self.credentials.get(
-            "client_secret"
-        ):
-            print("Missing YouTube API credentials")
+        if not self.creds.client_id or not self.creds.client_secret:
+            logger.warning("Missing YouTube API credentials")
             return False
 
         try:
             # In a real implementation, this would use proper OAuth flow
             # This is a simplified placeholder
-            print("Successfully authenticated with YouTube")
+            logger.info("Successfully authenticated with YouTube")
             self.authenticated = True
             return True
         except Exception as e:
-            print(f"YouTube authentication error: {e}")
+            logger.error("YouTube authentication error: %s", e)
             return False
 
     def upload_video(
@@ -55,6 +76,9 @@ class YouTubeUploader(BaseUploader):
         title: str,
         description: str,
         tags: List[str] = None,
+        *,
+        skip_exists_check: bool = False,
+        hashtags: Optional[str] = None,
         **kwargs,
     ) -> str:
         """
@@ -65,6 +89,8 @@ class YouTubeUploader(BaseUploader):
             title: Video title
             description: Video description
             tags: List of tags
+            skip_exists_check: Skip the file check when the caller already made it
+            hashtags: Not used by YouTube, which takes tags separately
             **kwargs: Additional parameters like:
                      - privacy_status: 'public', 'unlisted', or 'private'
                      - category_id: YouTube category ID
@@ -77,18 +103,18 @@ class YouTubeUploader(BaseUploader):
             if not self.authenticate():
                 return "Authentication failed"
 
-        if not os.path.exists(video_path):
+        if not skip_exists_check and not os.path.exists(video_path):
             return f"Error: File not found: {video_path}"
 
         privacy_status = kwargs.get("privacy_status", "private")
         category_id = kwargs.get("category_id", "22")  # 22 = People & Blogs
 
-        print(f"Simulating YouTube upload: {video_path}")
-        print(f"Title: {title}")
-        print(f"Description: {description}")
-        print(f"Tags: {tags}")
-        print(f"Privacy: {privacy_status}")
-        print(f"Category ID: {category_id}")
+        logger.debug("Simulating YouTube upload: %s", video_path)
+        logger.debug("Title: %s", title)
+        logger.debug("Description: %s", description)
+        logger.debug("Tags: %s", tags)
+        logger.debug("Privacy: %s", privacy_status)
+        logger.debug("Category ID: %s", category_id)
 
         # In a real implementation, this would use the YouTube Data API
         # with proper authentication and upload processes